@@ -2,33 +2,55 @@
 Repo2md: Export Git repository contents to structured Markdown files.
 """
 
-from importlib.metadata import version, PackageNotFoundError
-
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:
-    # package not installed, fallback to a dev default
-    __version__ = "0.0.0+dev"
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
 
 __author__ = "Georg Hildebrand"
 __email__ = "noreply@github.com"
 
-from .core import RepoFile, ScanResult, scan_repository, generate_markdown
-from .output import handle_output
-from .browser import open_ai_chat
-from .scope import (
-    ScopeConfig,
-    get_scoped_files,
-    get_files_from_recent_commits,
-    get_uncommitted_files,
-    get_files_from_glob_patterns,
-)
+if TYPE_CHECKING:
+    __version__: str
+
+    from .core import (
+        RepoFile,
+        ScanResult,
+        scan_repository,
+        generate_markdown,
+        iter_markdown,
+    )
+    from .output import handle_output
+    from .browser import open_ai_chat
+    from .scope import (
+        ScopeConfig,
+        get_scoped_files,
+        get_files_from_recent_commits,
+        get_uncommitted_files,
+        get_files_from_glob_patterns,
+    )
+
+# Public names and the submodule defining them. Submodules are imported on
+# first attribute access so that e.g. `repo2ai --help` stays fast.
+_EXPORTS = {
+    "RepoFile": ".core",
+    "ScanResult": ".core",
+    "scan_repository": ".core",
+    "generate_markdown": ".core",
+    "iter_markdown": ".core",
+    "handle_output": ".output",
+    "open_ai_chat": ".browser",
+    "ScopeConfig": ".scope",
+    "get_scoped_files": ".scope",
+    "get_files_from_recent_commits": ".scope",
+    "get_uncommitted_files": ".scope",
+    "get_files_from_glob_patterns": ".scope",
+}
 
 __all__ = [
     "RepoFile",
     "ScanResult",
     "scan_repository",
     "generate_markdown",
+    "iter_markdown",
     "handle_output",
     "open_ai_chat",
     "ScopeConfig",
@@ -37,3 +59,42 @@ __all__ = [
     "get_uncommitted_files",
     "get_files_from_glob_patterns",
 ]
+
+
+def _get_version() -> str:
+    """Look up the installed package version."""
+    # importlib.metadata scans sys.path and costs tens of milliseconds, so it
+    # only runs when __version__ is actually requested
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        return version(__name__)
+    except PackageNotFoundError:
+        # package not installed, fallback to a dev default
+        return "0.0.0+dev"
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names and submodules lazily."""
+    if name == "__version__":
+        value: Any = _get_version()
+        globals()[name] = value
+        return value
+
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        # Submodules such as `repo2ai.core` stay reachable after `import repo2ai`
+        try:
+            return import_module(f".{name}", __name__)
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__) | {"__version__"})
@@ -3,9 +3,10 @@ Browser automation for opening AI chat services.
 """
 
 import webbrowser
-import time
 import sys
-from typing import List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 # AI Service URLs
 AI_SERVICES = {
@@ -22,6 +23,9 @@ BROWSERS = {
     "edge": "microsoft-edge",
 }
 
+# Seconds to let the browser start after the first tab before opening more
+_BROWSER_STARTUP_DELAY = 1.0
+
 
 def get_browser_controller(browser_name: str) -> webbrowser.BaseBrowser:
     """Get browser controller for the specified browser."""
@@ -89,31 +93,51 @@ def open_ai_chat(
         True if at least one service was opened successfully
     """
     browser_controller = get_browser_controller(browser)
-    success_count = 0
 
+    targets: List[Tuple[str, str]] = []
     for service in services:
         if service not in AI_SERVICES:
             print(f"Warning: Unknown AI service '{service}', skipping", file=sys.stderr)
             continue
 
-        try:
-            url = create_chat_url(service, prompt)
+        url = create_chat_url(service, prompt)
+        if verbose:
+            print(f"Opening {service} at {url}", file=sys.stderr)
+        targets.append((service, url))
 
-            if verbose:
-                print(f"Opening {service} at {url}", file=sys.stderr)
+    if not targets:
+        return False
 
+    def open_tab(url: str) -> Optional[Exception]:
+        try:
             browser_controller.open_new_tab(url)
-            success_count += 1
+            return None
+        except Exception as e:
+            return e
 
-            # Show instructions
-            show_instructions(service, prompt)
+    urls = [url for _, url in targets]
 
-            # Small delay between opening multiple tabs
-            if len(services) > 1:
-                time.sleep(1)
+    # The first tab may have to start the browser; launching the others at
+    # the same time makes launchers race and open extra windows or drop tabs
+    errors = [open_tab(urls[0])]
+    if len(urls) > 1:
+        time.sleep(_BROWSER_STARTUP_DELAY)
 
-        except Exception as e:
-            print(f"Error opening {service}: {e}", file=sys.stderr)
+        # Once the browser is running, each remaining open only spawns a
+        # helper process, so these can run concurrently
+        with ThreadPoolExecutor(max_workers=len(urls) - 1) as executor:
+            errors.extend(executor.map(open_tab, urls[1:]))
+
+    success_count = 0
+    for (service, _), error in zip(targets, errors):
+        if error is not None:
+            print(f"Error opening {service}: {error}", file=sys.stderr)
+            continue
+
+        success_count += 1
+
+        # Show instructions
+        show_instructions(service, prompt)
 
     return success_count > 0
 
@@ -3,24 +3,28 @@ Command line interface for repo2ai with browser automation.
 """
 
 import argparse
+import logging
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO, Type
 
-from .core import scan_repository, generate_markdown
-from .output import handle_output
-from .browser import open_ai_chat
-from .scope import ScopeConfig
-from .pr import get_pr_context, generate_pr_markdown
+# Heavier modules are imported inside the functions that need them, so that
+# `--help` and argument errors don't pay for them.
+if TYPE_CHECKING:
+    from .core import ScanResult
+    from .scope import ScopeConfig
 
+logger = logging.getLogger("repo2ai")
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create and configure argument parser."""
-    parser = argparse.ArgumentParser(
-        prog="repo2ai",
-        description="Export Git repository contents to structured Markdown and optionally open AI chat",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+# Messages for errors that abort main(); subclasses use their closest base
+ERROR_MESSAGES: Dict[Type[BaseException], str] = {
+    FileNotFoundError: "Error: {error}",
+    KeyboardInterrupt: "\nOperation cancelled by user",
+    Exception: "Unexpected error: {error}",
+}
+
+# Help epilog; argparse only formats it when --help is requested
+EPILOG = """
 Examples:
   repo2ai .                                    # Export current directory
   repo2ai ./project --output docs.md          # Export to file
@@ -44,7 +48,16 @@ Pattern examples:
   src/**/*.py  Python files under src/
   *.md         Markdown files in root only
   tests/*      Files directly in tests/ (not subdirs)
-        """,
+"""
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create and configure argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="repo2ai",
+        description="Export Git repository contents to structured Markdown and optionally open AI chat",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG,
     )
 
     # Positional argument
@@ -149,7 +162,11 @@ Pattern examples:
 
 
 def validate_arguments(args: argparse.Namespace) -> None:
-    """Validate command line arguments."""
+    """
+    Validate command line arguments.
+
+    On success ``args.path`` is replaced by the resolved repository path.
+    """
     # Check if repository path exists
     repo_path = Path(args.path).resolve()
     if not repo_path.exists():
@@ -162,6 +179,9 @@ def validate_arguments(args: argparse.Namespace) -> None:
         )
         sys.exit(1)
 
+    # Reuse the resolved path downstream instead of resolving it again
+    args.path = repo_path
+
     # Check max file size
     if args.max_file_size <= 0:
         print("Error: Max file size must be positive", file=sys.stderr)
@@ -199,11 +219,13 @@ def process_exclude_patterns(args: argparse.Namespace) -> List[str]:
     return patterns
 
 
-def build_scope_config(args: argparse.Namespace) -> Optional[ScopeConfig]:
+def build_scope_config(args: argparse.Namespace) -> Optional["ScopeConfig"]:
     """Build ScopeConfig from CLI arguments."""
     if not args.recent and not args.uncommitted and not args.include:
         return None
 
+    from .scope import ScopeConfig
+
     return ScopeConfig(
         recent=args.recent,
         uncommitted=args.uncommitted,
@@ -213,18 +235,20 @@ def build_scope_config(args: argparse.Namespace) -> Optional[ScopeConfig]:
 
 def handle_pr_review(args: argparse.Namespace, repo_path: Path) -> str:
     """Handle PR review mode and return markdown content."""
+    from .pr import get_pr_context, generate_pr_markdown
+
     target = None if args.pr_review == "auto" else args.pr_review
 
-    print("Generating PR review context...", file=sys.stderr)
+    logger.info("Generating PR review context...")
 
     # Get PR context
     context = get_pr_context(repo_path, target)
 
-    print(
-        f"  Branch: {context.current_branch} → {context.target_branch}", file=sys.stderr
+    logger.info(
+        f"  Branch: {context.current_branch} → {context.target_branch}\n"
+        f"  Changed files: {len(context.changed_files)}\n"
+        f"  Commits: {context.commit_count}"
     )
-    print(f"  Changed files: {len(context.changed_files)}", file=sys.stderr)
-    print(f"  Commits: {context.commit_count}", file=sys.stderr)
 
     # Read file contents
     file_contents = {}
@@ -239,27 +263,68 @@ def handle_pr_review(args: argparse.Namespace, repo_path: Path) -> str:
     return generate_pr_markdown(context, file_contents)
 
 
-def main() -> None:
-    """Main entry point for the CLI."""
+def write_verbose_report(scan_result: "ScanResult", stream: TextIO) -> None:
+    """Write the included and ignored file lists to a stream."""
+    # One write call: a line-buffered stderr flushes on every write that
+    # contains a newline, so writing line by line means a syscall per path
+    included = "".join(f"  {p}\n" for p in scan_result.included_files)
+    ignored = "".join(f"  {p}\n" for p in scan_result.ignored_files)
+    stream.write(
+        "=== Verbose File Report ===\n"
+        f"Included files:\n{included}"
+        f"\nIgnored files:\n{ignored}"
+        "===========================\n"
+    )
+
+
+def format_error(error: BaseException) -> str:
+    """Format an error using the most specific entry in ERROR_MESSAGES."""
+    for error_type in type(error).__mro__:
+        if error_type in ERROR_MESSAGES:
+            return ERROR_MESSAGES[error_type].format(error=error)
+    return f"Unexpected error: {error}"
+
+
+def configure_logging() -> None:
+    """Send CLI status messages to stderr as plain text."""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for the CLI.
+
+    Args:
+        argv: Command-line arguments without the program name; defaults to
+            sys.argv[1:]
+    """
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    configure_logging()
 
     # Validate arguments
     validate_arguments(args)
 
+    from .output import handle_output
+
     # Process exclude patterns
     ignore_patterns = process_exclude_patterns(args)
     scope_config = build_scope_config(args)
 
     try:
-        repo_path = Path(args.path).resolve()
+        repo_path = args.path
 
         # PR review mode
         if args.pr_review:
             # Enable clipboard by default for PR review
             if not args.clipboard and not args.output and not args.stdout:
                 args.clipboard = True
-                print("Info: Enabling clipboard mode for PR review", file=sys.stderr)
+                logger.info("Info: Enabling clipboard mode for PR review")
 
             markdown_content = handle_pr_review(args, repo_path)
 
@@ -270,11 +335,14 @@ def main() -> None:
                 to_clipboard=args.clipboard,
                 to_stdout=args.stdout,
                 prompt=args.prompt if (args.open_chat or args.chat_all) else None,
+                ensure_parent=False,  # validate_arguments created it
             )
 
             # Open AI chat if requested
             if args.open_chat or args.chat_all:
-                print("Opening AI chat...", file=sys.stderr)
+                from .browser import open_ai_chat
+
+                logger.info("Opening AI chat...")
 
                 services = []
                 if args.chat_all:
@@ -290,28 +358,28 @@ def main() -> None:
                 )
 
                 if not success:
-                    print(
-                        "Warning: Could not open any AI chat service", file=sys.stderr
-                    )
+                    logger.warning("Warning: Could not open any AI chat service")
 
-            print("✓ PR review context ready", file=sys.stderr)
+            logger.info("✓ PR review context ready")
             return
         # Print scope info if verbose
         if args.verbose and scope_config and scope_config.is_scoped:
-            print("=== Scope Filtering ===", file=sys.stderr)
+            scope_lines = ["=== Scope Filtering ==="]
             if scope_config.recent:
-                print(f"  Recent commits: {scope_config.recent}", file=sys.stderr)
+                scope_lines.append(f"  Recent commits: {scope_config.recent}")
             if scope_config.uncommitted:
-                print("  Uncommitted changes: Yes", file=sys.stderr)
-            if scope_config.include_patterns:
-                for pattern in scope_config.include_patterns:
-                    print(f"  Include: {pattern}", file=sys.stderr)
-            print("=======================", file=sys.stderr)
+                scope_lines.append("  Uncommitted changes: Yes")
+            for pattern in scope_config.include_patterns:
+                scope_lines.append(f"  Include: {pattern}")
+            scope_lines.append("=======================")
+            logger.info("\n".join(scope_lines))
+
+        from .core import scan_repository, iter_markdown
 
         # Scan repository
-        print("Scanning repository...", file=sys.stderr)
+        logger.info("Scanning repository...")
         scan_result = scan_repository(
-            repo_path=Path(args.path),
+            repo_path=repo_path,
             ignore_patterns=ignore_patterns,
             exclude_meta_files=args.no_meta,
             max_file_size=args.max_file_size,
@@ -321,33 +389,29 @@ def main() -> None:
 
         # Print verbose report if requested
         if args.verbose:
-            print("=== Verbose File Report ===", file=sys.stderr)
-            print("Included files:", file=sys.stderr)
-            for p in scan_result.included_files:
-                print(f"  {p}", file=sys.stderr)
-            print("\nIgnored files:", file=sys.stderr)
-            for p in scan_result.ignored_files:
-                print(f"  {p}", file=sys.stderr)
-            print("===========================", file=sys.stderr)
+            write_verbose_report(scan_result, sys.stderr)
 
         # Generate markdown
-        print("Generating markdown...", file=sys.stderr)
-        markdown_content = generate_markdown(scan_result)
+        logger.info("Generating markdown...")
+        markdown_chunks = iter_markdown(scan_result)
 
         # Handle output
         handle_output(
-            content=markdown_content,
+            content=markdown_chunks,
             output_file=args.output,
             to_clipboard=args.clipboard,
             to_stdout=args.stdout,
             prompt=(
                 args.prompt if (args.open_chat or args.chat_all) else None
             ),  # Nur bei AI-Chat
+            ensure_parent=False,  # validate_arguments created it
         )
 
         # Open AI chat if requested
         if args.open_chat or args.chat_all:
-            print("Opening AI chat...", file=sys.stderr)
+            from .browser import open_ai_chat
+
+            logger.info("Opening AI chat...")
 
             services = []
             if args.chat_all:
@@ -363,21 +427,15 @@ def main() -> None:
             )
 
             if not success:
-                print("Warning: Could not open any AI chat service", file=sys.stderr)
+                logger.warning("Warning: Could not open any AI chat service")
 
         # Print summary
         file_count = len(scan_result.files)
         size_mb = scan_result.total_size / (1024 * 1024)
-        print(f"✓ Processed {file_count} files ({size_mb:.2f} MB)", file=sys.stderr)
+        logger.info(f"✓ Processed {file_count} files ({size_mb:.2f} MB)")
 
-    except FileNotFoundError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(1)
-    except KeyboardInterrupt:
-        print("\nOperation cancelled by user", file=sys.stderr)
-        sys.exit(1)
-    except Exception as e:
-        print(f"Unexpected error: {e}", file=sys.stderr)
+    except tuple(ERROR_MESSAGES) as e:
+        logger.error(format_error(e))
         sys.exit(1)
 
 
@@ -3,16 +3,101 @@ Core functionality for repository scanning and markdown generation.
 """
 
 import os
+import re
 import fnmatch
+import stat
 import subprocess
-from pathlib import Path
-from typing import TYPE_CHECKING, List, Optional, NamedTuple, Set
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path, PurePath
+from typing import (
+    TYPE_CHECKING,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    NamedTuple,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
 
 if TYPE_CHECKING:
     from .scope import ScopeConfig
 
 # TODO: insert logging and configure propper logger output
 
+# File reads are I/O bound and release the GIL, so use more threads than cores
+_MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Bytes inspected for NUL when detecting binary files (git uses 8000)
+_BINARY_PROBE_SIZE = 8192
+
+# Flags for the raw reads; O_BINARY keeps Windows from translating newlines
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Files found to be binary by earlier scans, keyed by (path, st_mtime_ns,
+# st_size) so a modified file gets probed again
+_BINARY_FILES: Set[Tuple[str, int, int]] = set()
+
+
+# Path flavour whose case folding and separator ignore matching follows;
+# a module attribute so tests can match as another platform would
+_IGNORE_PATH_MODULE = os.path
+
+# One .gitignore line with surrounding whitespace stripped; blank lines and
+# comments don't match
+_GITIGNORE_LINE_RE = re.compile(r"^[^\S\n]*([^#\s](?:[^\n]*\S)?)", re.MULTILINE)
+
+
+# Language names by lowercase file extension
+_EXTENSION_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".jsx": "jsx",
+    ".tsx": "tsx",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".sass": "sass",
+    ".less": "less",
+    ".java": "java",
+    ".cpp": "cpp",
+    ".c": "c",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".php": "php",
+    ".rb": "ruby",
+    ".go": "go",
+    ".rs": "rust",
+    ".kt": "kotlin",
+    ".swift": "swift",
+    ".scala": "scala",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".zsh": "zsh",
+    ".fish": "fish",
+    ".ps1": "powershell",
+    ".sql": "sql",
+    ".json": "json",
+    ".xml": "xml",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".ini": "ini",
+    ".cfg": "ini",
+    ".conf": "ini",
+    ".md": "markdown",
+    ".txt": "text",
+    ".log": "text",
+    ".dockerfile": "dockerfile",
+    ".gitignore": "gitignore",
+    ".gitattributes": "gitattributes",
+}
+
 
 class RepoFile(NamedTuple):
     """Represents a file in the repository."""
@@ -35,52 +120,6 @@ class ScanResult(NamedTuple):
 
 def _get_language_from_extension(file_path: Path) -> Optional[str]:
     """Determine programming language from file extension."""
-    extension_map = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".jsx": "jsx",
-        ".tsx": "tsx",
-        ".html": "html",
-        ".css": "css",
-        ".scss": "scss",
-        ".sass": "sass",
-        ".less": "less",
-        ".java": "java",
-        ".cpp": "cpp",
-        ".c": "c",
-        ".h": "c",
-        ".hpp": "cpp",
-        ".cs": "csharp",
-        ".php": "php",
-        ".rb": "ruby",
-        ".go": "go",
-        ".rs": "rust",
-        ".kt": "kotlin",
-        ".swift": "swift",
-        ".scala": "scala",
-        ".sh": "bash",
-        ".bash": "bash",
-        ".zsh": "zsh",
-        ".fish": "fish",
-        ".ps1": "powershell",
-        ".sql": "sql",
-        ".json": "json",
-        ".xml": "xml",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".toml": "toml",
-        ".ini": "ini",
-        ".cfg": "ini",
-        ".conf": "ini",
-        ".md": "markdown",
-        ".txt": "text",
-        ".log": "text",
-        ".dockerfile": "dockerfile",
-        ".gitignore": "gitignore",
-        ".gitattributes": "gitattributes",
-    }
-
     # Check for special files first (override extension-based detection)
     name = file_path.name.lower()
     if name == "dockerfile":
@@ -91,62 +130,189 @@ def _get_language_from_extension(file_path: Path) -> Optional[str]:
         return "markdown"
 
     # Then check extension mapping
-    suffix = file_path.suffix.lower()
-    if suffix in extension_map:
-        return extension_map[suffix]
-
-    return None
+    return _EXTENSION_LANGUAGES.get(file_path.suffix.lower())
 
 
 def _parse_gitignore(gitignore_path: Path) -> List[str]:
     """Parse .gitignore file and return list of patterns."""
-    patterns: List[str] = []
-
     if not gitignore_path.exists():
-        return patterns
+        return []
 
     try:
         with open(gitignore_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if line and not line.startswith("#"):
-                    patterns.append(line)
+            content = f.read()
     except (IOError, UnicodeDecodeError):
         # If we can't read the file, skip it
-        pass
+        return []
 
-    return patterns
+    # Stripped lines, skipping empty lines and comments
+    return _GITIGNORE_LINE_RE.findall(content)
 
 
-def _should_ignore_file(
-    file_path: Path, repo_root: Path, ignore_patterns: List[str]
-) -> bool:
-    """Check if file should be ignored based on patterns."""
-    relative_path = file_path.relative_to(repo_root)
-    relative_path_str = str(relative_path)
+# Characters that make a pattern a glob rather than a literal string
+_GLOB_CHARS = frozenset("*?[")
+
+
+class _IgnoreMatcher(NamedTuple):
+    """
+    Ignore patterns sorted into buckets by the cheapest way to match them.
+
+    Literal names, "*suffix" and "prefix*" patterns and plain "dir/" patterns
+    are checked with set lookups and str methods. Only the remaining globs
+    go through the regular expressions.
+    """
+
+    names: FrozenSet[str]
+    paths: FrozenSet[str]
+    suffixes: Tuple[str, ...]
+    prefixes: Tuple[str, ...]
+    dir_names: FrozenSet[str]
+    path_regex: Optional[Pattern[str]]
+    name_regex: Optional[Pattern[str]]
+
+
+def _compile_regex_union(parts: List[str]) -> Optional[Pattern[str]]:
+    """Combine regex sources into a single alternation."""
+    if not parts:
+        return None
+    return re.compile("|".join(f"(?:{part})" for part in parts))
+
+
+def _is_literal(pattern: str) -> bool:
+    """Check whether a pattern contains no glob characters."""
+    return _GLOB_CHARS.isdisjoint(pattern)
+
+
+def _normcase_path(path: str) -> str:
+    """Case-fold a relative path like os.path.normcase, keeping "/" separators."""
+    path = _IGNORE_PATH_MODULE.normcase(path)
+    # On Windows normcase turns "/" into "\\"; patterns are written with "/"
+    if _IGNORE_PATH_MODULE.sep != "/":
+        path = path.replace(_IGNORE_PATH_MODULE.sep, "/")
+    return path
+
+
+def _compile_ignore_patterns(ignore_patterns: List[str]) -> _IgnoreMatcher:
+    """
+    Compile ignore patterns for matching relative paths and file names.
+
+    Directory patterns (ending in "/") match files anywhere below a directory
+    of that name. All other patterns match either the relative path or the
+    file name, with the same semantics as fnmatch.
+    """
+    names: Set[str] = set()
+    paths: Set[str] = set()
+    suffixes: List[str] = []
+    prefixes: List[str] = []
+    dir_names: Set[str] = set()
+    path_parts: List[str] = []
+    name_parts: List[str] = []
 
     for pattern in ignore_patterns:
+        pattern = _normcase_path(pattern)
         # Handle directory patterns
         if pattern.endswith("/"):
-            # Check if file is inside this directory
             pattern_no_slash = pattern[:-1]
-            if (
-                fnmatch.fnmatch(relative_path_str, f"{pattern_no_slash}/*")
-                or fnmatch.fnmatch(relative_path_str, f"*/{pattern_no_slash}/*")
-                or relative_path_str.startswith(f"{pattern_no_slash}/")
-            ):
-                return True
+            if _is_literal(pattern_no_slash) and "/" not in pattern_no_slash:
+                # "d/*" and "*/d/*" both mean some parent directory is d
+                dir_names.add(pattern_no_slash)
+                continue
+            path_parts.append(fnmatch.translate(f"{pattern_no_slash}/*"))
+            path_parts.append(fnmatch.translate(f"*/{pattern_no_slash}/*"))
+            path_parts.append(re.escape(f"{pattern_no_slash}/"))
+        elif _is_literal(pattern):
+            # A path without "/" is its own file name
+            if "/" in pattern:
+                paths.add(pattern)
+            else:
+                names.add(pattern)
+        elif (
+            pattern.startswith("*") and _is_literal(pattern[1:]) and "/" not in pattern
+        ):
+            # fnmatch's "*" spans "/", so the path and the name share a suffix
+            suffixes.append(pattern[1:])
+        elif pattern.endswith("*") and _is_literal(pattern[:-1]):
+            prefixes.append(pattern[:-1])
         else:
-            # Check against full path and filename
-            if fnmatch.fnmatch(relative_path_str, pattern) or fnmatch.fnmatch(
-                file_path.name, pattern
-            ):
-                return True
+            translated = fnmatch.translate(pattern)
+            path_parts.append(translated)
+            name_parts.append(translated)
+
+    return _IgnoreMatcher(
+        names=frozenset(names),
+        paths=frozenset(paths),
+        suffixes=tuple(suffixes),
+        prefixes=tuple(prefixes),
+        dir_names=frozenset(dir_names),
+        path_regex=_compile_regex_union(path_parts),
+        name_regex=_compile_regex_union(name_parts),
+    )
+
+
+@lru_cache(maxsize=256)
+def _cached_ignore_matcher(ignore_patterns: Tuple[str, ...]) -> _IgnoreMatcher:
+    """Compile a pattern tuple, reusing earlier results for equal tuples."""
+    return _compile_ignore_patterns(list(ignore_patterns))
+
+
+def _is_ignored(ignore_matcher: _IgnoreMatcher, relative_path: str, name: str) -> bool:
+    """Check a relative path and its file name against compiled patterns."""
+    relative_path = _normcase_path(relative_path)
+    name = _IGNORE_PATH_MODULE.normcase(name)
+
+    if name in ignore_matcher.names or relative_path in ignore_matcher.paths:
+        return True
+    if ignore_matcher.suffixes and name.endswith(ignore_matcher.suffixes):
+        return True
+    prefixes = ignore_matcher.prefixes
+    if prefixes and (relative_path.startswith(prefixes) or name.startswith(prefixes)):
+        return True
+    if ignore_matcher.dir_names and not ignore_matcher.dir_names.isdisjoint(
+        relative_path.split("/")[:-1]
+    ):
+        return True
+
+    path_regex = ignore_matcher.path_regex
+    if path_regex is not None and path_regex.match(relative_path):
+        return True
+    name_regex = ignore_matcher.name_regex
+    if name_regex is not None and name_regex.match(name):
+        return True
 
     return False
 
 
+def _is_directory_ignored(ignore_matcher: _IgnoreMatcher, relative_path: str) -> bool:
+    """Check whether every file below a directory is ignored by the patterns."""
+    relative_path = _normcase_path(relative_path)
+
+    # "dir/" patterns ignore anything with such a directory among its parents
+    if ignore_matcher.dir_names and not ignore_matcher.dir_names.isdisjoint(
+        relative_path.split("/")
+    ):
+        return True
+    # "prefix*" patterns like ".git/*" cover every path starting with "dir/"
+    prefixes = ignore_matcher.prefixes
+    return bool(prefixes) and f"{relative_path}/".startswith(prefixes)
+
+
+def _should_ignore_file(
+    file_path: PurePath,
+    repo_root: PurePath,
+    ignore_patterns: Union[List[str], _IgnoreMatcher],
+) -> bool:
+    """
+    Check if file should be ignored based on patterns.
+
+    Only path arithmetic is done, so pure paths work and nothing is stat'ed.
+    """
+    if not isinstance(ignore_patterns, _IgnoreMatcher):
+        ignore_patterns = _cached_ignore_matcher(tuple(ignore_patterns))
+
+    relative_path_str = str(file_path.relative_to(repo_root))
+    return _is_ignored(ignore_patterns, relative_path_str, file_path.name)
+
+
 def _get_git_files(repo_root: Path) -> Set[Path]:
     """Get list of files tracked by Git."""
     try:
@@ -170,14 +336,93 @@ def _get_git_files(repo_root: Path) -> Set[Path]:
         return set()
 
 
-def _is_binary_file(file_path: Path) -> bool:
-    """Check if file is binary by reading first few bytes."""
+def _read_rest(fd: int, head: bytes) -> bytes:
+    """Read fd to the end with raw os.read calls, after head was read from it."""
+    chunk_size = _BINARY_PROBE_SIZE
+    if len(head) == _BINARY_PROBE_SIZE:
+        # One byte more than what is left means a single call normally reads it
+        chunk_size = max(os.fstat(fd).st_size - len(head), 0) + 1
+    chunks = [head]
+    while True:
+        chunk = os.read(fd, chunk_size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _read_text_file(
+    file_path: Path, cache_key: Optional[Tuple[str, int, int]] = None
+) -> Optional[str]:
+    """Read a UTF-8 text file, returning None for binary or unreadable files."""
     try:
-        with open(file_path, "rb") as f:
-            chunk = f.read(1024)
-            return b"\x00" in chunk
-    except (IOError, OSError):
-        return True
+        fd = os.open(file_path, _OPEN_FLAGS)
+    except OSError:
+        return None
+    try:
+        # Probe the first block for NUL before reading the rest, so a large
+        # binary file costs one small read
+        head = os.read(fd, _BINARY_PROBE_SIZE)
+        if b"\x00" in head:
+            if cache_key is not None:
+                _BINARY_FILES.add(cache_key)
+            return None
+        data = _read_rest(fd, head)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+    # Normalize newlines the way text-mode open() does
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _iter_repository_files(
+    repo_root: Path, ignore_matcher: _IgnoreMatcher
+) -> Iterator[Tuple[os.DirEntry[str], str]]:
+    """
+    Walk the repository with os.scandir and yield non-directory entries.
+
+    Yields each entry together with its path relative to repo_root.
+    Directories matching the ignore patterns, or whose files would all be
+    ignored (such as .git/ and node_modules/), are not descended into. Like
+    os.walk, entries come top-down in directory listing order and symlinked
+    directories are not followed.
+    """
+    root = str(repo_root)
+    # Entry paths are built by joining onto root, so slicing yields the
+    # relative path without constructing Path objects
+    prefix_length = len(os.path.join(root, ""))
+    stack = [root]
+
+    while stack:
+        subdirectories = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    relative_path = entry.path[prefix_length:]
+                    if entry.is_dir(follow_symlinks=False):
+                        if _is_directory_ignored(ignore_matcher, relative_path):
+                            continue
+                        if not _is_ignored(ignore_matcher, relative_path, entry.name):
+                            subdirectories.append(entry.path)
+                    elif not entry.is_dir():
+                        # Dangling symlinks and special files are yielded too,
+                        # so the scan can report them as ignored
+                        yield entry, relative_path
+        except OSError:
+            # Unreadable directory, skip it like os.walk does
+            continue
+        # Reversed so the first subdirectory is popped first, giving the
+        # same top-down order as os.walk
+        stack.extend(reversed(subdirectories))
 
 
 def scan_repository(
@@ -263,85 +508,104 @@ def scan_repository(
 
     all_patterns.extend(default_patterns)
 
+    # Compile all patterns once; repeated scans with the same patterns
+    # reuse the cached matcher
+    ignore_matcher = _cached_ignore_matcher(tuple(all_patterns))
+
     # Get Git-tracked files if available
     git_files = _get_git_files(repo_root)
 
+    # Membership is checked on the entry's path string, so the walk doesn't
+    # build a Path for every file it visits
+    git_paths = {os.path.normcase(path) for path in git_files}
+    scope_paths: Optional[Set[str]] = None
+    if scope_whitelist is not None:
+        scope_paths = {os.path.normcase(path) for path in scope_whitelist}
+
     files = []
     total_size = 0
     ignored_files: List[Path] = []
     included_files: List[Path] = []
+    candidate_paths: List[Path] = []
+    candidate_sizes: List[int] = []
+    candidate_keys: List[Tuple[str, int, int]] = []
 
     # Walk through directory
-    for root, dirs, filenames in os.walk(repo_root):
-        root_path = Path(root)
-
-        # Skip directories that match ignore patterns
-        dirs[:] = [
-            d
-            for d in dirs
-            if not _should_ignore_file(root_path / d, repo_root, all_patterns)
-        ]
-
-        for filename in filenames:
-            file_path = root_path / filename
+    for entry, relative_path in _iter_repository_files(repo_root, ignore_matcher):
+        entry_path = entry.path
 
-            # Skip if file matches ignore patterns
-            if _should_ignore_file(file_path, repo_root, all_patterns):
-                if verbose:
-                    ignored_files.append(file_path)
-                continue
-
-            # If we have Git files, only include tracked files
-            if git_files and file_path not in git_files:
-                if verbose:
-                    ignored_files.append(file_path)
-                continue
+        # Skip if file matches ignore patterns
+        if _is_ignored(ignore_matcher, relative_path, entry.name):
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
 
-            # If scope whitelist exists, only include whitelisted files
-            if scope_whitelist is not None and file_path not in scope_whitelist:
-                if verbose:
-                    ignored_files.append(file_path)
-                continue
+        # If we have Git files, only include tracked files
+        if git_paths and os.path.normcase(entry_path) not in git_paths:
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
 
-            # Check file size
-            try:
-                file_size = file_path.stat().st_size
-                if file_size > max_file_size:
-                    if verbose:
-                        ignored_files.append(file_path)
-                    continue
-            except (OSError, IOError):
-                if verbose:
-                    ignored_files.append(file_path)
-                continue
+        # If scope whitelist exists, only include whitelisted files
+        if scope_paths is not None and os.path.normcase(entry_path) not in scope_paths:
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
+
+        # Check file size (DirEntry caches the stat result); dangling
+        # symlinks fail here and FIFOs or sockets are not regular files
+        try:
+            stat_result = entry.stat()
+        except (OSError, IOError):
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
+        if not stat.S_ISREG(stat_result.st_mode):
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
 
-            # Skip binary files
-            if _is_binary_file(file_path):
-                if verbose:
-                    ignored_files.append(file_path)
-                continue
+        file_size = stat_result.st_size
+        if file_size > max_file_size:
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
 
-            # Read file content
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-            except (IOError, UnicodeDecodeError):
-                # Skip files we can't read
-                if verbose:
-                    ignored_files.append(file_path)
-                continue
+        # Skip unchanged files an earlier scan already found to be binary
+        cache_key = (entry_path, stat_result.st_mtime_ns, file_size)
+        if cache_key in _BINARY_FILES:
+            if verbose:
+                ignored_files.append(Path(entry_path))
+            continue
+
+        candidate_paths.append(Path(entry_path))
+        candidate_sizes.append(file_size)
+        candidate_keys.append(cache_key)
+
+    # Read file contents concurrently; map() keeps the walk order
+    with ThreadPoolExecutor(max_workers=_MAX_READ_WORKERS) as executor:
+        contents = list(executor.map(_read_text_file, candidate_paths, candidate_keys))
+
+    for file_path, file_size, content in zip(
+        candidate_paths, candidate_sizes, contents
+    ):
+        # Skip binary files and files we can't read
+        if content is None:
+            if verbose:
+                ignored_files.append(file_path)
+            continue
 
-            # Determine language
-            language = _get_language_from_extension(file_path)
+        # Determine language
+        language = _get_language_from_extension(file_path)
 
-            repo_file = RepoFile(
-                path=file_path, content=content, size=file_size, language=language
-            )
+        repo_file = RepoFile(
+            path=file_path, content=content, size=file_size, language=language
+        )
 
-            files.append(repo_file)
-            total_size += file_size
-            if verbose:
-                included_files.append(file_path)
+        files.append(repo_file)
+        total_size += file_size
+        if verbose:
+            included_files.append(file_path)
 
     return ScanResult(
         files=files,
@@ -352,15 +616,19 @@ def scan_repository(
     )
 
 
-def generate_markdown(scan_result: ScanResult) -> str:
+def iter_markdown(scan_result: ScanResult) -> Iterator[str]:
     """
-    Generate Markdown from scan result.
+    Generate Markdown from scan result as a stream of chunks.
+
+    The header and file structure are emitted first, followed by one chunk
+    per file, so callers can start writing output before every file has been
+    formatted.
 
     Args:
         scan_result: Result from scan_repository
 
-    Returns:
-        Generated Markdown content
+    Yields:
+        Consecutive pieces of the generated Markdown content
     """
     lines = []
 
@@ -409,15 +677,14 @@ def generate_markdown(scan_result: ScanResult) -> str:
 
     # File contents
     lines.append("## File Contents")
-    lines.append("")
+    yield "\n".join(lines)
 
     # Sort files by path
     sorted_files = sorted(scan_result.files, key=lambda f: f.path)
 
     for file in sorted_files:
         relative_path = file.path.relative_to(scan_result.repo_root)
-        lines.append(f"### {relative_path}")
-        lines.append("")
+        lines = ["", "", f"### {relative_path}", ""]
 
         # Add file info
         lines.append(f"**Size:** {file.size} bytes")
@@ -430,8 +697,24 @@ def generate_markdown(scan_result: ScanResult) -> str:
             lines.append(f"```{file.language}")
         else:
             lines.append("```")
-        lines.append(file.content)
-        lines.append("```")
         lines.append("")
+        yield "\n".join(lines)
+
+        # Yield the content on its own so it isn't copied into a joined chunk
+        yield file.content
+        yield "\n```"
 
-    return "\n".join(lines)
+    yield "\n"
+
+
+def generate_markdown(scan_result: ScanResult) -> str:
+    """
+    Generate Markdown from scan result.
+
+    Args:
+        scan_result: Result from scan_repository
+
+    Returns:
+        Generated Markdown content
+    """
+    return "".join(iter_markdown(scan_result))
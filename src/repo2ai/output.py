@@ -2,9 +2,13 @@
 Output handling for file, clipboard, and stdout.
 """
 
+import os
+import shutil
+import subprocess
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Union
 
 try:
     import pyperclip
@@ -15,32 +19,73 @@ except ImportError:
 
 # TODO: add logging
 
+# Large write buffer so many small per-file chunks become few write() calls
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _native_clipboard_command() -> Optional[List[str]]:
+    """
+    Find a clipboard command that reads UTF-8 text from stdin.
+
+    Resolved on first clipboard use and cached for the process, so file and
+    stdout runs never probe PATH. None means fall back to pyperclip.
+    """
+    candidates: List[List[str]] = []
+    if sys.platform == "darwin":
+        candidates.append(["pbcopy"])
+    elif sys.platform.startswith("linux"):
+        if os.environ.get("WAYLAND_DISPLAY"):
+            candidates.append(["wl-copy"])
+        if os.environ.get("DISPLAY"):
+            candidates.append(["xclip", "-selection", "clipboard"])
+
+    for command in candidates:
+        if shutil.which(command[0]):
+            return command
+    return None
+
 
 def handle_output(
-    content: str,
+    content: Union[str, Iterable[str]],
     output_file: Optional[Path] = None,
     to_clipboard: bool = False,
     to_stdout: bool = False,
     prompt: Optional[str] = None,  # Neuer Parameter
+    ensure_parent: bool = True,
 ) -> None:
     """
     Handle output to file, clipboard, and/or stdout.
+
+    ``content`` may be a string or an iterable of string chunks. Chunks are
+    streamed to a single file or stdout target; they are only joined into one
+    string when the clipboard or more than one target needs the full content.
+
+    Set ``ensure_parent`` to False when the caller has already created the
+    output file's parent directory.
     """
     # Default to stdout if no output options specified
     if not output_file and not to_clipboard and not to_stdout:
         to_stdout = True
 
+    # An iterable can only be consumed once
+    if not isinstance(content, str) and (to_clipboard or (output_file and to_stdout)):
+        content = "".join(content)
+
     # Prompt mit Content kombinieren für Clipboard
-    clipboard_content = content
+    clipboard_content = content if isinstance(content, str) else ""
     if to_clipboard and prompt:
         clipboard_content = f"{prompt}\n\n---\n\n{content}"
 
     # Write to file (ohne Prompt)
     if output_file:
         try:
-            output_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(content)  # Datei ohne Prompt
+            if ensure_parent:
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(
+                output_file, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+            ) as f:
+                f.writelines(_iter_chunks(content))  # Datei ohne Prompt
             print(f"✓ Markdown exported to: {output_file}", file=sys.stderr)
         except (IOError, OSError) as e:
             print(f"✗ Error writing to file {output_file}: {e}", file=sys.stderr)
@@ -48,7 +93,7 @@ def handle_output(
 
     # Copy to clipboard (mit Prompt falls vorhanden)
     if to_clipboard:
-        if not PYPERCLIP_AVAILABLE:
+        if _native_clipboard_command() is None and not PYPERCLIP_AVAILABLE:
             print(
                 "✗ Error: pyperclip not available. Install with: pip install pyperclip",
                 file=sys.stderr,
@@ -56,7 +101,7 @@ def handle_output(
             sys.exit(1)
 
         try:
-            pyperclip.copy(clipboard_content)  # Mit Prompt
+            _copy_to_clipboard(clipboard_content)  # Mit Prompt
             if prompt:
                 print("✓ Markdown + prompt copied to clipboard", file=sys.stderr)
             else:
@@ -67,7 +112,25 @@ def handle_output(
 
     # Output to stdout (ohne Prompt)
     if to_stdout:
-        print(content)
+        for chunk in _iter_chunks(content):
+            sys.stdout.write(chunk)
+        sys.stdout.write("\n")
+
+
+def _copy_to_clipboard(text: str) -> None:
+    """Copy text with the native clipboard command, or pyperclip as fallback."""
+    command = _native_clipboard_command()
+    if command is not None:
+        subprocess.run(command, input=text.encode("utf-8"), check=True)
+    else:
+        pyperclip.copy(text)
+
+
+def _iter_chunks(content: Union[str, Iterable[str]]) -> Iterable[str]:
+    """Return content as an iterable of chunks without splitting strings."""
+    if isinstance(content, str):
+        return (content,)
+    return content
 
 
 def get_default_output_filename(repo_path: Path) -> Path:
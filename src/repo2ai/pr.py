@@ -3,7 +3,7 @@
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set
 
 
 def get_target_branch(
@@ -30,9 +30,44 @@ def get_target_branch(
     if explicit_target:
         return explicit_target
 
-    current = get_current_branch(repo_root)
+    return _detect_target_branch(repo_root, get_current_branch(repo_root))
+
+
+def _existing_revisions(repo_root: Path, revisions: List[str]) -> Set[str]:
+    """
+    Return the revisions that resolve to an object in the repository.
+
+    All names are checked by one `git cat-file --batch-check` process instead
+    of one `git rev-parse --verify` per name.
+    """
+    if not revisions:
+        return set()
+
+    try:
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            cwd=repo_root,
+            input="".join(f"{revision}\n" for revision in revisions),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return set()
+
+    existing = set()
+    for revision, line in zip(revisions, result.stdout.splitlines()):
+        # Found objects print "<sha> <type> <size>", others "<name> missing"
+        if len(line.split(" ")) == 3:
+            existing.add(revision)
+
+    return existing
+
 
+def _detect_target_branch(repo_root: Path, current: str) -> str:
+    """Detect the target branch for a checkout on branch current."""
     # 1. Try to get remote default branch (origin/HEAD)
+    remote_default = ""
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "origin/HEAD"],
@@ -41,46 +76,31 @@ def get_target_branch(
             text=True,
             check=True,
         )
-        target = result.stdout.strip()
-        if target.startswith("origin/"):
-            target = target[len("origin/") :]
-        if target and target != current:
-            # Check if this branch actually exists locally or remotely
-            subprocess.run(
-                ["git", "rev-parse", "--verify", target],
-                cwd=repo_root,
-                capture_output=True,
-                check=True,
-            )
-            return target
+        remote_default = result.stdout.strip()
+        if remote_default.startswith("origin/"):
+            remote_default = remote_default[len("origin/") :]
+        if remote_default == current:
+            remote_default = ""
     except subprocess.CalledProcessError:
         pass
 
-    # 2. Check common base branches
-    for candidate in ["main", "master", "develop", "dev"]:
-        if candidate == current:
-            continue
-        try:
-            # Check if candidate exists locally
-            subprocess.run(
-                ["git", "rev-parse", "--verify", candidate],
-                cwd=repo_root,
-                capture_output=True,
-                check=True,
-            )
+    # 2. Check common base branches, locally or on origin; all existence
+    # checks, including the remote default, share one git process
+    candidates = [
+        candidate
+        for candidate in ["main", "master", "develop", "dev"]
+        if candidate != current
+    ]
+    revisions = [remote_default] if remote_default else []
+    for candidate in candidates:
+        revisions.extend([candidate, f"origin/{candidate}"])
+    existing = _existing_revisions(repo_root, revisions)
+
+    if remote_default and remote_default in existing:
+        return remote_default
+    for candidate in candidates:
+        if candidate in existing or f"origin/{candidate}" in existing:
             return candidate
-        except subprocess.CalledProcessError:
-            try:
-                # Check if candidate exists on origin
-                subprocess.run(
-                    ["git", "rev-parse", "--verify", f"origin/{candidate}"],
-                    cwd=repo_root,
-                    capture_output=True,
-                    check=True,
-                )
-                return candidate
-            except subprocess.CalledProcessError:
-                continue
 
     # 3. Try upstream tracking branch if it's different
     try:
@@ -224,8 +244,9 @@ def get_pr_context(
     Returns:
         PRContext with all review information
     """
-    target = get_target_branch(repo_root, target_branch)
+    # Resolve the current branch once; target detection needs it too
     current = get_current_branch(repo_root)
+    target = target_branch or _detect_target_branch(repo_root, current)
 
     return PRContext(
         current_branch=current,
@@ -7,11 +7,16 @@ Provides filtering by:
 - Glob patterns (--include PATTERN)
 """
 
-import glob as glob_module
+import fnmatch
+import os
+import re
 import subprocess
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import Iterator, List, Optional, Pattern, Set, Tuple
+
+# A compiled glob pattern: one regex per path segment, None for "**"
+_GlobSegments = List[Optional[Pattern[str]]]
 
 
 @dataclass
@@ -65,6 +70,29 @@ def get_files_from_recent_commits(
         return set()
 
 
+# Space-separated fields before the path in `git status --porcelain=v2`
+# records: ordinary changes, renames or copies, unmerged paths, untracked
+_STATUS_PATH_FIELDS = {b"1": 8, b"2": 9, b"u": 10, b"?": 1}
+
+
+def _parse_status_paths(output: bytes) -> Iterator[str]:
+    """
+    Yield the paths listed in `git status --porcelain=v2 -z` output.
+
+    Paths are relative to the top level of the repository. Records
+    without a path, such as branch headers, are skipped.
+    """
+    records = iter(output.split(b"\0"))
+    for record in records:
+        field_count = _STATUS_PATH_FIELDS.get(record[:1])
+        if field_count is None:
+            continue
+        if record[:1] == b"2":
+            # The original path of a rename follows as its own record
+            next(records, None)
+        yield os.fsdecode(record.split(b" ", field_count)[-1])
+
+
 def get_uncommitted_files(repo_root: Path) -> Set[Path]:
     """
     Get files with uncommitted changes (staged, unstaged, and untracked).
@@ -75,55 +103,137 @@ def get_uncommitted_files(repo_root: Path) -> Set[Path]:
     Returns:
         Set of absolute file paths with uncommitted changes
     """
-    files = set()
-
     try:
-        # Get modified/deleted files (unstaged)
+        # repo_root may be a subdirectory of the repository, while status
+        # paths are relative to its top level
         result = subprocess.run(
-            ["git", "diff", "--name-only"],
+            ["git", "rev-parse", "--show-prefix"],
             cwd=repo_root,
             capture_output=True,
-            text=True,
             check=True,
         )
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                file_path = repo_root / line
-                if file_path.exists():
-                    files.add(file_path)
+        prefix = os.fsdecode(result.stdout.rstrip(b"\n"))
 
-        # Get staged files
+        # One status call covers unstaged, staged and untracked files
         result = subprocess.run(
-            ["git", "diff", "--name-only", "--cached"],
+            [
+                "git",
+                "status",
+                "--porcelain=v2",
+                "-z",
+                "--untracked-files=all",
+                "--no-renames",
+                "--ignore-submodules=all",
+                "--",
+                ".",
+            ],
             cwd=repo_root,
             capture_output=True,
-            text=True,
             check=True,
         )
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                file_path = repo_root / line
-                if file_path.exists():
-                    files.add(file_path)
-
-        # Get untracked files
-        result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            cwd=repo_root,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                file_path = repo_root / line
-                if file_path.exists():
-                    files.add(file_path)
-
-        return files
     except (subprocess.CalledProcessError, FileNotFoundError):
         return set()
 
+    files = set()
+    for path in _parse_status_paths(result.stdout):
+        if not path.startswith(prefix):
+            continue
+        file_path = repo_root / path[len(prefix) :]
+        if file_path.exists():
+            files.add(file_path)
+
+    return files
+
+
+def _compile_glob_pattern(pattern: str) -> _GlobSegments:
+    """
+    Compile a glob pattern into one regex per path segment.
+
+    A "**" segment is kept as None and matches zero or more directories.
+    As with glob, wildcards do not match names starting with a dot unless
+    the segment itself starts with one.
+    """
+    segments: _GlobSegments = []
+    for segment in pattern.replace(os.sep, "/").split("/"):
+        if segment in ("", "."):
+            continue
+        if segment == "**":
+            if not segments or segments[-1] is not None:
+                segments.append(None)
+            continue
+        regex = fnmatch.translate(os.path.normcase(segment))
+        if not segment.startswith("."):
+            regex = r"(?!\.)" + regex
+        segments.append(re.compile(regex))
+    return segments
+
+
+def _skip_recursive_segments(
+    compiled: List[_GlobSegments], positions: Set[Tuple[int, int]]
+) -> Set[Tuple[int, int]]:
+    """Add the position after each "**" segment, which may match no directory."""
+    expanded = set(positions)
+    for index, position in positions:
+        segments = compiled[index]
+        while position < len(segments) and segments[position] is None:
+            position += 1
+            expanded.add((index, position))
+    return expanded
+
+
+def _glob_files(repo_root: Path, compiled: List[_GlobSegments]) -> Set[Path]:
+    """
+    Walk repo_root once with os.scandir and collect files matching any pattern.
+
+    Each directory carries the (pattern, segment) positions that can still
+    match below it, so only those directories are entered, and each is
+    read once however many patterns reach it. Symlinked directories are
+    not followed.
+    """
+    files = set()
+    initial = {(index, 0) for index in range(len(compiled))}
+    stack = [(str(repo_root), _skip_recursive_segments(compiled, initial))]
+
+    while stack:
+        directory, positions = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    name = os.path.normcase(entry.name)
+                    matched = False
+                    child_positions = set()
+                    for index, position in positions:
+                        segments = compiled[index]
+                        last = len(segments) - 1
+                        if position > last:
+                            continue
+                        segment = segments[position]
+                        if segment is None:
+                            if name.startswith("."):
+                                continue
+                            child_positions.add((index, position))
+                            matched = matched or position == last
+                        elif segment.match(name):
+                            if position == last:
+                                matched = True
+                            else:
+                                child_positions.add((index, position + 1))
+
+                    if entry.is_dir(follow_symlinks=False):
+                        if child_positions:
+                            stack.append(
+                                (
+                                    entry.path,
+                                    _skip_recursive_segments(compiled, child_positions),
+                                )
+                            )
+                    elif matched and entry.is_file():
+                        files.add(Path(entry.path))
+        except OSError:
+            continue
+
+    return files
+
 
 def get_files_from_glob_patterns(
     repo_root: Path,
@@ -145,16 +255,16 @@ def get_files_from_glob_patterns(
     Returns:
         Set of absolute file paths matching any pattern
     """
-    files = set()
-
-    for pattern in patterns:
-        full_pattern = str(repo_root / pattern)
-        for match in glob_module.glob(full_pattern, recursive=True):
-            file_path = Path(match)
-            if file_path.is_file():
-                files.add(file_path)
+    # A trailing separator only matches directories
+    compiled = [
+        _compile_glob_pattern(pattern)
+        for pattern in dict.fromkeys(patterns)
+        if not pattern.endswith(("/", os.sep))
+    ]
+    if not compiled:
+        return set()
 
-    return files
+    return _glob_files(repo_root, compiled)
 
 
 def get_scoped_files(
@@ -0,0 +1,148 @@
+"""
+Helpers for building throwaway git repositories in tests.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import TestCase
+
+# Commit identity passed through the environment, so no `git config` runs,
+# and the user's and system git configuration kept out of the tests
+_GIT_ENV = {
+    **os.environ,
+    "GIT_CONFIG_GLOBAL": os.devnull,
+    "GIT_CONFIG_NOSYSTEM": "1",
+    "GIT_AUTHOR_NAME": "Test",
+    "GIT_AUTHOR_EMAIL": "test@test.com",
+    "GIT_COMMITTER_NAME": "Test",
+    "GIT_COMMITTER_EMAIL": "test@test.com",
+}
+
+# Written into each test repository, so that the git commands run by the
+# code under test, which do not use _GIT_ENV, skip these as well
+_REPO_CONFIG = """\
+[gc]
+\tauto = 0
+[core]
+\tfsmonitor = false
+[commit]
+\tgpgSign = false
+"""
+
+
+def run_git(repo_root: Path, *args: str) -> subprocess.CompletedProcess:
+    """Run a git command in repo_root and return the completed process."""
+    return subprocess.run(
+        ["git", "-C", str(repo_root), *args],
+        env=_GIT_ENV,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+    )
+
+
+def _fast_import_stream(commits: List[Dict[str, Any]]) -> bytes:
+    """Build a git fast-import stream that creates the given commits."""
+    stream = []
+    branch = "main"
+    tips: Dict[str, int] = {}
+    parent = None
+
+    for mark, commit in enumerate(commits, start=1):
+        if "branch" in commit:
+            branch = commit["branch"]
+        message = commit["message"].encode()
+        stream.append(
+            b"commit refs/heads/%s\nmark :%d\n"
+            b"committer Test <test@test.com> now\ndata %d\n%s\n"
+            % (branch.encode(), mark, len(message), message)
+        )
+        parent = tips.get(branch, parent)
+        if parent is not None:
+            stream.append(b"from :%d\n" % parent)
+        for relative_path, content in commit["files"].items():
+            data = content.encode()
+            stream.append(
+                b"M 100644 inline %s\ndata %d\n%s\n"
+                % (relative_path.encode(), len(data), data)
+            )
+        tips[branch] = parent = mark
+
+    return b"".join(stream)
+
+
+def init_repo_with_history(repo_root: Path, commits: List[Dict[str, Any]]) -> None:
+    """
+    Create a git repository on branch main and commit the given history.
+
+    Each commit is a dict with "files" (relative path to content) and a
+    "message", plus an optional "branch" that is created from the current
+    commit before committing. The work tree is left on the last commit's
+    branch.
+
+    The whole history goes through a single git fast-import, so building
+    a repository costs three git processes however many commits it has.
+
+    Args:
+        repo_root: Existing directory to initialise
+        commits: Commits to create, oldest first
+    """
+    # An empty template skips copying the sample hooks into every repository
+    run_git(repo_root, "init", "--quiet", "--template=", "-b", "main")
+    with open(repo_root / ".git" / "config", "a") as config_file:
+        config_file.write(_REPO_CONFIG)
+
+    if not commits:
+        return
+
+    subprocess.run(
+        ["git", "-C", str(repo_root), "fast-import", "--quiet", "--date-format=now"],
+        env=_GIT_ENV,
+        input=_fast_import_stream(commits),
+        capture_output=True,
+        check=True,
+    )
+    branch = next(
+        (commit["branch"] for commit in reversed(commits) if "branch" in commit),
+        "main",
+    )
+    run_git(repo_root, "checkout", "--quiet", "--force", branch)
+
+
+class GitRepoTestCase(TestCase):
+    """
+    Test case with a git repository built once for the whole class.
+
+    Subclasses set HISTORY to the commits for init_repo_with_history() and
+    may override prepare_repo() to change the work tree afterwards. Classes
+    whose tests change the repository set MUTATES_REPO, so that each test
+    works on its own copy.
+    """
+
+    HISTORY: List[Dict[str, Any]] = []
+    MUTATES_REPO = False
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the class repository in a temporary directory."""
+        super().setUpClass()
+        cls.template_root = Path(cls.enterClassContext(tempfile.TemporaryDirectory()))
+        init_repo_with_history(cls.template_root, cls.HISTORY)
+        cls.prepare_repo(cls.template_root)
+        cls.repo_root = cls.template_root
+
+    @classmethod
+    def prepare_repo(cls, repo_root: Path) -> None:
+        """Adjust the repository after its history has been committed."""
+
+    def setUp(self):
+        """Copy the class repository for tests that change it."""
+        super().setUp()
+        if self.MUTATES_REPO:
+            temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+            self.repo_root = Path(
+                shutil.copytree(self.template_root, Path(temp_dir) / "repo")
+            )
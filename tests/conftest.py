@@ -0,0 +1,20 @@
+"""
+Shared pytest configuration.
+"""
+
+import os
+import sys
+import tempfile
+
+# Memory-backed filesystem for test temporary directories on Linux
+_SHM_DIR = "/dev/shm"
+
+
+def pytest_configure(config):
+    """Create temporary directories in shared memory unless TMPDIR is set."""
+    if (
+        sys.platform == "linux"
+        and "TMPDIR" not in os.environ
+        and os.access(_SHM_DIR, os.W_OK | os.X_OK)
+    ):
+        tempfile.tempdir = _SHM_DIR
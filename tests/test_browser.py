@@ -19,6 +19,12 @@ from repo2ai.browser import (
 class TestBrowserAutomation(unittest.TestCase):
     """Test browser automation functionality."""
 
+    def setUp(self):
+        """Skip the real browser startup delay."""
+        sleep_patcher = patch("repo2ai.browser.time.sleep")
+        self.mock_sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
     def test_create_chat_url(self):
         """Test chat URL creation."""
         # Test valid services
@@ -83,6 +89,54 @@ class TestBrowserAutomation(unittest.TestCase):
             self.assertFalse(success)
             mock_browser.open_new_tab.assert_not_called()
 
+    @patch("repo2ai.browser.webbrowser")
+    def test_open_ai_chat_partial_failure(self, mock_webbrowser):
+        """Test one failing service does not prevent the others."""
+        mock_browser = MagicMock()
+        mock_webbrowser.get.return_value = mock_browser
+
+        def open_new_tab(url):
+            if url == AI_SERVICES["claude"]:
+                raise RuntimeError("boom")
+
+        mock_browser.open_new_tab.side_effect = open_new_tab
+
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            success = open_ai_chat(["chatgpt", "claude", "gemini"])
+
+        self.assertTrue(success)
+        self.assertEqual(mock_browser.open_new_tab.call_count, 3)
+        self.assertIn("Error opening claude: boom", mock_stderr.getvalue())
+
+    @patch("repo2ai.browser.webbrowser")
+    def test_first_tab_opens_before_the_rest(self, mock_webbrowser):
+        """Test the first tab starts the browser before the others open."""
+        mock_browser = MagicMock()
+        mock_webbrowser.get.return_value = mock_browser
+        events = []
+        self.mock_sleep.side_effect = lambda seconds: events.append("sleep")
+        mock_browser.open_new_tab.side_effect = events.append
+
+        with patch("sys.stderr", new_callable=StringIO):
+            success = open_ai_chat(["chatgpt", "claude", "gemini"])
+
+        self.assertTrue(success)
+        self.assertEqual(events[:2], [AI_SERVICES["chatgpt"], "sleep"])
+        self.assertCountEqual(
+            events[2:], [AI_SERVICES["claude"], AI_SERVICES["gemini"]]
+        )
+        self.mock_sleep.assert_called_once()
+
+    @patch("repo2ai.browser.webbrowser")
+    def test_single_tab_does_not_wait(self, mock_webbrowser):
+        """Test opening one service skips the startup delay."""
+        mock_webbrowser.get.return_value = MagicMock()
+
+        with patch("sys.stderr", new_callable=StringIO):
+            open_ai_chat(["chatgpt"])
+
+        self.mock_sleep.assert_not_called()
+
     @patch("pyperclip.paste")
     def test_check_clipboard_content(self, mock_paste):
         """Test clipboard content checking."""
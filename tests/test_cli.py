@@ -13,17 +13,22 @@ from repo2ai.cli import (
     create_parser,
     validate_arguments,
     process_exclude_patterns,
+    format_error,
+    write_verbose_report,
     main,
 )
 from repo2ai.core import RepoFile, ScanResult
 
+# parse_args() leaves the parser untouched, so all tests can share one
+_PARSER = create_parser()
+
 
 class TestCLIParser(TestCase):
     """Test CLI argument parsing."""
 
     def setUp(self):
         """Set up test parser."""
-        self.parser = create_parser()
+        self.parser = _PARSER
 
     def test_basic_parsing(self):
         """Test basic argument parsing."""
@@ -78,16 +83,11 @@ class TestCLIParser(TestCase):
 class TestArgumentValidation(TestCase):
     """Test argument validation."""
 
-    def setUp(self):
-        """Set up test directory."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_path = Path(self.temp_dir)
-
-    def tearDown(self):
-        """Clean up test directory."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Set up test directory shared by the class."""
+        cls.temp_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.test_path = Path(cls.temp_dir)
 
     def test_valid_directory(self):
         """Test validation of valid directory."""
@@ -104,6 +104,9 @@ class TestArgumentValidation(TestCase):
         # Should not raise exception
         validate_arguments(args)
 
+        # Path is resolved once and stored for reuse
+        self.assertEqual(args.path, self.test_path.resolve())
+
     def test_nonexistent_directory(self):
         """Test validation of non-existent directory."""
         args = argparse.Namespace(
@@ -176,6 +179,92 @@ class TestIgnorePatterns(TestCase):
         self.assertEqual(patterns, [])
 
 
+class TestVerboseReport(TestCase):
+    """Test the verbose file report."""
+
+    def test_write_verbose_report(self):
+        """Test included and ignored files are listed in order."""
+        from io import StringIO
+
+        repo_root = Path("/repo")
+        scan_result = ScanResult(
+            files=[],
+            repo_root=repo_root,
+            total_size=0,
+            ignored_files=[repo_root / "a.log"],
+            included_files=[repo_root / "a.py", repo_root / "b.py"],
+        )
+        stream = StringIO()
+
+        write_verbose_report(scan_result, stream)
+
+        self.assertEqual(
+            stream.getvalue(),
+            "=== Verbose File Report ===\n"
+            "Included files:\n"
+            f"  {repo_root / 'a.py'}\n"
+            f"  {repo_root / 'b.py'}\n"
+            "\nIgnored files:\n"
+            f"  {repo_root / 'a.log'}\n"
+            "===========================\n",
+        )
+
+    def test_verbose_report_is_one_write_on_line_buffered_stream(self):
+        """Test a large report reaches a line-buffered stream in one write."""
+        import io
+
+        class CountingRaw(io.RawIOBase):
+            """Raw stream that counts the writes reaching it."""
+
+            def __init__(self):
+                super().__init__()
+                self.writes = 0
+
+            def writable(self):
+                return True
+
+            def write(self, data):
+                self.writes += 1
+                return len(data)
+
+        repo_root = Path("/repo")
+        scan_result = ScanResult(
+            files=[],
+            repo_root=repo_root,
+            total_size=0,
+            ignored_files=[repo_root / f"{i}.log" for i in range(1000)],
+            included_files=[repo_root / f"{i}.py" for i in range(2000)],
+        )
+        raw = CountingRaw()
+        stream = io.TextIOWrapper(
+            io.BufferedWriter(raw), encoding="utf-8", line_buffering=True
+        )
+
+        write_verbose_report(scan_result, stream)
+
+        self.assertEqual(raw.writes, 1)
+
+
+class TestErrorFormatting(TestCase):
+    """Test translation of errors into CLI messages."""
+
+    def test_format_known_errors(self):
+        """Test each mapped error type gets its message."""
+        self.assertEqual(format_error(FileNotFoundError("gone")), "Error: gone")
+        self.assertEqual(
+            format_error(KeyboardInterrupt()), "\nOperation cancelled by user"
+        )
+        self.assertEqual(format_error(ValueError("bad")), "Unexpected error: bad")
+
+    def test_format_uses_closest_base_class(self):
+        """Test subclasses fall back to the nearest mapped base class."""
+
+        class MissingRepo(FileNotFoundError):
+            pass
+
+        self.assertEqual(format_error(MissingRepo("gone")), "Error: gone")
+
+
 class TestScopeIntegration(TestCase):
     """Test scope arguments integration."""
 
@@ -184,7 +273,7 @@ class TestScopeIntegration(TestCase):
         from repo2ai.cli import build_scope_config
         from repo2ai.scope import ScopeConfig
 
-        parser = create_parser()
+        parser = _PARSER
         args = parser.parse_args(
             [
                 ".",
@@ -207,7 +296,7 @@ class TestScopeIntegration(TestCase):
         """Test ScopeConfig is None when no scope arguments."""
         from repo2ai.cli import build_scope_config
 
-        parser = create_parser()
+        parser = _PARSER
         args = parser.parse_args(["."])
 
         config = build_scope_config(args)
@@ -220,28 +309,28 @@ class TestScopeArguments(TestCase):
 
     def test_recent_argument(self):
         """Test --recent argument."""
-        parser = create_parser()
+        parser = _PARSER
         args = parser.parse_args([".", "--recent", "3"])
 
         self.assertEqual(args.recent, 3)
 
     def test_uncommitted_argument(self):
         """Test --uncommitted argument."""
-        parser = create_parser()
+        parser = _PARSER
         args = parser.parse_args([".", "--uncommitted"])
 
         self.assertTrue(args.uncommitted)
 
     def test_include_argument(self):
         """Test --include argument."""
-        parser = create_parser()
+        parser = _PARSER
         args = parser.parse_args([".", "--include", "**/*.py", "--include", "*.md"])
 
         self.assertEqual(args.include, ["**/*.py", "*.md"])
 
     def test_scope_arguments_default_values(self):
         """Test scope arguments have correct defaults."""
-        parser = create_parser()
+        parser = _PARSER
         args = parser.parse_args(["."])
 
         self.assertIsNone(args.recent)
@@ -252,24 +341,19 @@ class TestScopeArguments(TestCase):
 class TestCLIIntegration(TestCase):
     """Test CLI integration."""
 
-    def setUp(self):
-        """Set up test repository."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_path = Path(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Set up test repository shared by the class."""
+        cls.temp_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.repo_path = Path(cls.temp_dir)
 
         # Create test files
-        (self.repo_path / "test.py").write_text('print("Hello")')
-        (self.repo_path / "README.md").write_text("# Test Repository")
-
-    def tearDown(self):
-        """Clean up test repository."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+        (cls.repo_path / "test.py").write_text('print("Hello")')
+        (cls.repo_path / "README.md").write_text("# Test Repository")
 
-    @patch("repo2ai.cli.scan_repository")
-    @patch("repo2ai.cli.generate_markdown")
-    @patch("repo2ai.cli.handle_output")
+    @patch("repo2ai.core.scan_repository")
+    @patch("repo2ai.core.iter_markdown")
+    @patch("repo2ai.output.handle_output")
     def test_main_function(self, mock_output, mock_generate, mock_scan):
         """Test main function execution."""
         from repo2ai.cli import main
@@ -291,22 +375,19 @@ class TestCLIIntegration(TestCase):
         )
 
         mock_scan.return_value = mock_scan_result
-        mock_generate.return_value = "# Test Markdown"
+        mock_generate.return_value = iter(["# Test Markdown"])
 
         # Test with mocked arguments
-        test_args = ["repo2ai", str(self.repo_path), "--stdout"]
-
-        with patch("sys.argv", test_args):
-            main()
+        main([str(self.repo_path), "--stdout"])
 
         # Verify mocks were called
         mock_scan.assert_called_once()
         mock_generate.assert_called_once_with(mock_scan_result)
         mock_output.assert_called_once()
 
-    @patch("repo2ai.cli.handle_output")
-    @patch("repo2ai.cli.generate_markdown")
-    @patch("repo2ai.cli.scan_repository")
+    @patch("repo2ai.output.handle_output")
+    @patch("repo2ai.core.iter_markdown")
+    @patch("repo2ai.core.scan_repository")
     def test_verbose_integration(self, mock_scan, mock_generate, mock_output):
         """Test CLI with verbose flag captures stderr output."""
         from io import StringIO
@@ -330,14 +411,11 @@ class TestCLIIntegration(TestCase):
         )
 
         mock_scan.return_value = mock_scan_result
-        mock_generate.return_value = "# Test Markdown"
+        mock_generate.return_value = iter(["# Test Markdown"])
 
         # Test with verbose flag
-        test_args = ["repo2ai", str(self.repo_path), "--verbose", "--stdout"]
-
-        with patch("sys.argv", test_args):
-            with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
-                main()
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            main([str(self.repo_path), "--verbose", "--stdout"])
 
         # Verify verbose output appears in stderr
         stderr_output = mock_stderr.getvalue()
@@ -352,6 +430,19 @@ class TestCLIIntegration(TestCase):
         call_kwargs = mock_scan.call_args[1]
         self.assertTrue(call_kwargs["verbose"])
 
+    @patch("repo2ai.core.scan_repository")
+    def test_main_reports_errors(self, mock_scan):
+        """Test errors during the run exit with status 1 and a message."""
+        from io import StringIO
+
+        mock_scan.side_effect = FileNotFoundError("missing repo")
+        with patch("sys.stderr", new_callable=StringIO) as mock_stderr:
+            with self.assertRaises(SystemExit) as cm:
+                main([str(self.repo_path), "--stdout"])
+
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("Error: missing repo", mock_stderr.getvalue())
+
 
 if __name__ == "__main__":
     import unittest
@@ -2,61 +2,66 @@
 Tests for core functionality.
 """
 
+import ntpath
 import tempfile
 import os
-from pathlib import Path
+import shutil
+from pathlib import Path, PurePosixPath, PureWindowsPath
 from unittest import TestCase
+from unittest.mock import patch
 
 from repo2ai.core import (
     RepoFile,
     ScanResult,
     scan_repository,
     generate_markdown,
+    iter_markdown,
     _get_language_from_extension,
     _parse_gitignore,
     _should_ignore_file,
-    _is_binary_file,
+    _compile_ignore_patterns,
+    _is_directory_ignored,
+    _cached_ignore_matcher,
+    _read_text_file,
+    _read_rest,
 )
 
 
 class TestLanguageDetection(TestCase):
     """Test language detection from file extensions."""
 
-    def test_python_files(self):
-        """Test Python file detection."""
-        self.assertEqual(_get_language_from_extension(Path("test.py")), "python")
-
-    def test_javascript_files(self):
-        """Test JavaScript file detection."""
-        self.assertEqual(_get_language_from_extension(Path("test.js")), "javascript")
-        self.assertEqual(_get_language_from_extension(Path("test.ts")), "typescript")
-        self.assertEqual(_get_language_from_extension(Path("test.jsx")), "jsx")
-        self.assertEqual(_get_language_from_extension(Path("test.tsx")), "tsx")
-
-    def test_markup_files(self):
-        """Test markup file detection."""
-        self.assertEqual(_get_language_from_extension(Path("test.md")), "markdown")
-        self.assertEqual(_get_language_from_extension(Path("test.html")), "html")
-        self.assertEqual(_get_language_from_extension(Path("test.xml")), "xml")
-
-    def test_config_files(self):
-        """Test configuration file detection."""
-        self.assertEqual(_get_language_from_extension(Path("test.json")), "json")
-        self.assertEqual(_get_language_from_extension(Path("test.yaml")), "yaml")
-        self.assertEqual(_get_language_from_extension(Path("test.yml")), "yaml")
-        self.assertEqual(_get_language_from_extension(Path("test.toml")), "toml")
-
-    def test_special_files(self):
-        """Test special file detection."""
-        self.assertEqual(_get_language_from_extension(Path("Dockerfile")), "dockerfile")
-        self.assertEqual(_get_language_from_extension(Path("Makefile")), "makefile")
-        self.assertEqual(_get_language_from_extension(Path("README.md")), "markdown")
-        self.assertEqual(_get_language_from_extension(Path("readme.txt")), "markdown")
-
-    def test_unknown_files(self):
-        """Test unknown file extensions."""
-        self.assertIsNone(_get_language_from_extension(Path("test.unknown")))
-        self.assertIsNone(_get_language_from_extension(Path("test")))
+    CASES = {
+        # Python
+        "test.py": "python",
+        # JavaScript
+        "test.js": "javascript",
+        "test.ts": "typescript",
+        "test.jsx": "jsx",
+        "test.tsx": "tsx",
+        # Markup
+        "test.md": "markdown",
+        "test.html": "html",
+        "test.xml": "xml",
+        # Configuration
+        "test.json": "json",
+        "test.yaml": "yaml",
+        "test.yml": "yaml",
+        "test.toml": "toml",
+        # Special files
+        "Dockerfile": "dockerfile",
+        "Makefile": "makefile",
+        "README.md": "markdown",
+        "readme.txt": "markdown",
+        # Unknown
+        "test.unknown": None,
+        "test": None,
+    }
+
+    def test_language_detection(self):
+        """Test detection for each known file name."""
+        for name, language in self.CASES.items():
+            with self.subTest(name=name):
+                self.assertEqual(_get_language_from_extension(Path(name)), language)
 
 
 class TestGitignoreParser(TestCase):
@@ -64,11 +69,10 @@ class TestGitignoreParser(TestCase):
 
     def test_parse_gitignore(self):
         """Test parsing .gitignore content."""
-        with tempfile.NamedTemporaryFile(
-            mode="w", delete=False, suffix=".gitignore"
-        ) as f:
-            f.write(
-                """# Comment
+        temp_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        gitignore = temp_dir / ".gitignore"
+        gitignore.write_text(
+            """# Comment
 *.pyc
 __pycache__/
 .env
@@ -77,14 +81,11 @@ __pycache__/
 node_modules/
 dist/
 """
-            )
-            f.flush()
-
-            patterns = _parse_gitignore(Path(f.name))
-            expected = ["*.pyc", "__pycache__/", ".env", "node_modules/", "dist/"]
-            self.assertEqual(patterns, expected)
+        )
 
-            os.unlink(f.name)
+        patterns = _parse_gitignore(gitignore)
+        expected = ["*.pyc", "__pycache__/", ".env", "node_modules/", "dist/"]
+        self.assertEqual(patterns, expected)
 
     def test_nonexistent_gitignore(self):
         """Test handling of non-existent .gitignore."""
@@ -97,71 +98,189 @@ class TestFileFiltering(TestCase):
 
     def test_should_ignore_file(self):
         """Test file ignore patterns."""
-        repo_root = Path("/repo")
+        repo_root = PurePosixPath("/repo")
 
         # Test exact match
         self.assertTrue(
-            _should_ignore_file(Path("/repo/test.pyc"), repo_root, ["*.pyc"])
+            _should_ignore_file(PurePosixPath("/repo/test.pyc"), repo_root, ["*.pyc"])
         )
 
         # Test directory pattern
         self.assertTrue(
             _should_ignore_file(
-                Path("/repo/__pycache__/test.py"), repo_root, ["__pycache__/"]
+                PurePosixPath("/repo/__pycache__/test.py"), repo_root, ["__pycache__/"]
             )
         )
 
         # Test no match
         self.assertFalse(
-            _should_ignore_file(Path("/repo/test.py"), repo_root, ["*.pyc"])
+            _should_ignore_file(PurePosixPath("/repo/test.py"), repo_root, ["*.pyc"])
         )
 
-    def test_binary_file_detection(self):
-        """Test binary file detection."""
-        # Create a text file
-        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
-            f.write("This is a text file")
-            text_file = Path(f.name)
+    def test_compiled_ignore_patterns(self):
+        """Test precompiled patterns behave like the pattern list."""
+        repo_root = Path("/repo")
+        patterns = ["*.pyc", "__pycache__/", ".github/*", "README*"]
+        matcher = _compile_ignore_patterns(patterns)
+
+        cases = {
+            "test.pyc": True,
+            "pkg/mod.pyc": True,
+            "pkg/__pycache__/mod.py": True,
+            ".github/ci.yml": True,
+            "docs/README.md": True,
+            "pkg/mod.py": False,
+            "github/ci.yml": False,
+        }
+        for relative_path, expected in cases.items():
+            file_path = repo_root / relative_path
+            with self.subTest(path=relative_path):
+                self.assertEqual(
+                    _should_ignore_file(file_path, repo_root, matcher), expected
+                )
+                self.assertEqual(
+                    _should_ignore_file(file_path, repo_root, patterns), expected
+                )
+
+    def test_simple_patterns_skip_regex(self):
+        """Test literal, suffix, prefix and directory patterns avoid regexes."""
+        repo_root = Path("/repo")
+        patterns = [".env", "docs/notes.txt", "*.log", "README*", "build/"]
+        matcher = _compile_ignore_patterns(patterns)
+
+        self.assertIsNone(matcher.path_regex)
+        self.assertIsNone(matcher.name_regex)
+
+        cases = {
+            ".env": True,
+            "pkg/.env": True,
+            "docs/notes.txt": True,
+            "pkg/docs/notes.txt": False,
+            "pkg/debug.log": True,
+            "README.md": True,
+            "README-dir/mod.py": True,
+            "pkg/build/out.js": True,
+            "build.py": False,
+            "pkg/build": False,
+        }
+        for relative_path, expected in cases.items():
+            file_path = repo_root / relative_path
+            with self.subTest(path=relative_path):
+                self.assertEqual(
+                    _should_ignore_file(file_path, repo_root, matcher), expected
+                )
+
+    def test_windows_paths_use_buckets(self):
+        """Test Windows case folding keeps "/" patterns in their buckets."""
+        repo_root = PureWindowsPath("C:/repo")
+        patterns = ["node_modules/", "docs/notes.txt", "Build/*", "*.LOG"]
+
+        # Exercise ntpath.normcase, which lowercases and turns "/" into "\\"
+        with patch("repo2ai.core._IGNORE_PATH_MODULE", ntpath):
+            matcher = _compile_ignore_patterns(patterns)
+            self.assertEqual(matcher.dir_names, frozenset({"node_modules"}))
+            self.assertEqual(matcher.paths, frozenset({"docs/notes.txt"}))
+            self.assertTrue(_is_directory_ignored(matcher, "src\\Node_Modules"))
+            self.assertTrue(_is_directory_ignored(matcher, "build"))
+
+            cases = {
+                "src\\node_modules\\index.js": True,
+                "Docs\\Notes.txt": True,
+                "build\\out.js": True,
+                "logs\\Debug.log": True,
+                "src\\main.py": False,
+            }
+            for relative_path, expected in cases.items():
+                file_path = repo_root / relative_path
+                with self.subTest(path=relative_path):
+                    self.assertEqual(
+                        _should_ignore_file(file_path, repo_root, matcher), expected
+                    )
+
+    def test_pattern_list_is_compiled_once(self):
+        """Test repeated calls with the same pattern list reuse the matcher."""
+        repo_root = Path("/repo")
+        patterns = ["*.cache-test", "build-cache-test/"]
+        _cached_ignore_matcher.cache_clear()
+
+        for name in ("a.cache-test", "b.py", "c.cache-test"):
+            _should_ignore_file(repo_root / name, repo_root, patterns)
 
-        # Create a binary file
-        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
-            f.write(b"\x00\x01\x02\x03")
-            binary_file = Path(f.name)
+        info = _cached_ignore_matcher.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
 
-        try:
-            self.assertFalse(_is_binary_file(text_file))
-            self.assertTrue(_is_binary_file(binary_file))
-        finally:
-            os.unlink(text_file)
-            os.unlink(binary_file)
+    def test_binary_file_detection(self):
+        """Test scanning skips files with NUL in their first block."""
+        repo_root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (repo_root / "text.txt").write_text("This is a text file")
+        (repo_root / "binary.dat").write_bytes(b"\x00\x01\x02\x03")
+        # First NUL byte past the first kilobyte, still inside the probe
+        (repo_root / "late_binary.dat").write_bytes(b"x" * 4000 + b"\x00")
+
+        result = scan_repository(repo_root, verbose=True)
+
+        self.assertEqual([f.path.name for f in result.files], ["text.txt"])
+        self.assertIn(repo_root / "binary.dat", result.ignored_files)
+        self.assertIn(repo_root / "late_binary.dat", result.ignored_files)
+
+    def test_read_text_file(self):
+        """Test text reading normalizes newlines and rejects binary files."""
+        temp_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        text_file = temp_dir / "text.txt"
+        text_file.write_bytes("line one\r\nline two\rline three\n".encode("utf-8"))
+        invalid_file = temp_dir / "invalid.txt"
+        invalid_file.write_bytes(b"\xff\xfe not utf-8")
+        binary_file = temp_dir / "binary.dat"
+        binary_file.write_bytes(b"text\x00binary")
+
+        self.assertEqual(_read_text_file(text_file), "line one\nline two\nline three\n")
+        self.assertIsNone(_read_text_file(invalid_file))
+        self.assertIsNone(_read_text_file(binary_file))
+        self.assertIsNone(_read_text_file(temp_dir / "missing.txt"))
+
+    def test_read_text_file_probes_before_full_read(self):
+        """Test large binary files are rejected without reading them whole."""
+        temp_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        binary_file = temp_dir / "image.bin"
+        binary_file.write_bytes(b"\x89PNG\x00" + b"x" * 500_000)
+        text_file = temp_dir / "large.txt"
+        text_file.write_bytes(b"line\n" * 100_000)
+
+        with patch("repo2ai.core._read_rest", side_effect=_read_rest) as mock_read_rest:
+            self.assertIsNone(_read_text_file(binary_file))
+            mock_read_rest.assert_not_called()
+
+            self.assertEqual(_read_text_file(text_file), "line\n" * 100_000)
+            mock_read_rest.assert_called_once()
 
 
 class TestRepositoryScanning(TestCase):
     """Test repository scanning functionality."""
 
-    def setUp(self):
-        """Set up test repository."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_path = Path(self.temp_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Set up one test repository shared by the class."""
+        cls.temp_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.repo_path = Path(cls.temp_dir) / "repo"
+        cls.repo_path.mkdir()
 
         # Create test files
-        (self.repo_path / "test.py").write_text('print("Hello")')
-        (self.repo_path / "test.js").write_text('console.log("Hello")')
-        (self.repo_path / "README.md").write_text("# Test Repository")
-        (self.repo_path / ".gitignore").write_text("*.pyc\n__pycache__/")
+        (cls.repo_path / "test.py").write_text('print("Hello")')
+        (cls.repo_path / "test.js").write_text('console.log("Hello")')
+        (cls.repo_path / "README.md").write_text("# Test Repository")
+        (cls.repo_path / ".gitignore").write_text("*.pyc\n__pycache__/")
 
         # Create subdirectory
-        (self.repo_path / "subdir").mkdir()
-        (self.repo_path / "subdir" / "test.txt").write_text("Test content")
+        (cls.repo_path / "subdir").mkdir()
+        (cls.repo_path / "subdir" / "test.txt").write_text("Test content")
 
         # Create binary file
-        (self.repo_path / "binary.bin").write_bytes(b"\x00\x01\x02\x03")
+        (cls.repo_path / "binary.bin").write_bytes(b"\x00\x01\x02\x03")
 
-    def tearDown(self):
-        """Clean up test repository."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+    def copy_repo(self):
+        """Copy the shared repository for a test that adds files to it."""
+        return Path(shutil.copytree(self.repo_path, Path(self.temp_dir) / self.id()))
 
     def test_scan_repository(self):
         """Test basic repository scanning."""
@@ -186,15 +305,49 @@ class TestRepositoryScanning(TestCase):
 
     def test_file_size_limit(self):
         """Test file size limiting."""
+        repo_path = self.copy_repo()
+
         # Create a large file
         large_content = "x" * 1000
-        (self.repo_path / "large.txt").write_text(large_content)
+        (repo_path / "large.txt").write_text(large_content)
 
-        result = scan_repository(self.repo_path, max_file_size=500)
+        result = scan_repository(repo_path, max_file_size=500)
 
         file_paths = [f.path.name for f in result.files]
         self.assertNotIn("large.txt", file_paths)
 
+    def test_oversized_files_are_not_opened(self):
+        """Test the size limit is applied before any file is read."""
+        repo_path = self.copy_repo()
+        (repo_path / "large.txt").write_text("x" * 1000)
+
+        with patch(
+            "repo2ai.core._read_text_file", side_effect=_read_text_file
+        ) as mock_read:
+            result = scan_repository(repo_path, max_file_size=500, verbose=True)
+
+        read_names = {call.args[0].name for call in mock_read.call_args_list}
+        self.assertNotIn("large.txt", read_names)
+        self.assertIn("test.py", read_names)
+        ignored_names = [p.name for p in result.ignored_files]
+        self.assertIn("large.txt", ignored_names)
+
+    def test_known_binary_files_are_not_reopened(self):
+        """Test unchanged binary files are skipped on repeated scans."""
+        repo_path = self.copy_repo()
+        (repo_path / "image.bin").write_bytes(b"\x00\x01\x02")
+
+        scan_repository(repo_path)
+        with patch(
+            "repo2ai.core._read_text_file", side_effect=_read_text_file
+        ) as mock_read:
+            result = scan_repository(repo_path, verbose=True)
+
+        read_names = {call.args[0].name for call in mock_read.call_args_list}
+        self.assertNotIn("image.bin", read_names)
+        ignored_names = [p.name for p in result.ignored_files]
+        self.assertIn("image.bin", ignored_names)
+
     def test_additional_ignore_patterns(self):
         """Test additional ignore patterns."""
         result = scan_repository(self.repo_path, ignore_patterns=["*.js"])
@@ -202,6 +355,52 @@ class TestRepositoryScanning(TestCase):
         file_paths = [f.path.name for f in result.files]
         self.assertNotIn("test.js", file_paths)
 
+    def test_nested_directories_and_pruning(self):
+        """Test nested files are found and ignored directories are skipped."""
+        repo_path = self.copy_repo()
+        nested = repo_path / "subdir" / "deeper"
+        nested.mkdir()
+        (nested / "nested.py").write_text("# nested")
+        (repo_path / "node_modules" / "pkg").mkdir(parents=True)
+        (repo_path / "node_modules" / "pkg" / "index.js").write_text("//")
+
+        result = scan_repository(repo_path, verbose=True)
+
+        file_paths = [f.path.name for f in result.files]
+        self.assertIn("nested.py", file_paths)
+        self.assertIn("test.txt", file_paths)
+        self.assertNotIn("index.js", file_paths)
+
+        # node_modules/ is pruned, so its files are never even listed
+        ignored_names = [p.name for p in result.ignored_files]
+        self.assertNotIn("index.js", ignored_names)
+
+    def test_scan_order_matches_os_walk(self):
+        """Test files are listed in the same top-down order as os.walk."""
+        repo_path = self.copy_repo()
+        for directory in ("a", "a/b", "c", "c/d"):
+            (repo_path / directory).mkdir(parents=True, exist_ok=True)
+            (repo_path / directory / "file.py").write_text("#")
+
+        result = scan_repository(repo_path, verbose=True)
+
+        walk_order = [
+            Path(root) / name for root, _, names in os.walk(repo_path) for name in names
+        ]
+        for listed in (result.included_files, result.ignored_files):
+            self.assertEqual(listed, sorted(listed, key=walk_order.index))
+
+    def test_repeated_scans_reuse_ignore_matcher(self):
+        """Test scanning twice with the same patterns compiles them once."""
+        _cached_ignore_matcher.cache_clear()
+
+        scan_repository(self.repo_path, ignore_patterns=["*.js"])
+        scan_repository(self.repo_path, ignore_patterns=["*.js"])
+
+        info = _cached_ignore_matcher.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+
     def test_verbose_tracking(self):
         """Test verbose file tracking."""
         # Test with verbose=True
@@ -230,24 +429,34 @@ class TestRepositoryScanning(TestCase):
         ignored_names = [p.name for p in result_with_ignores.ignored_files]
         self.assertIn("test.js", ignored_names)
 
+    def test_verbose_reports_dangling_symlinks(self):
+        """Test dangling symlinks and FIFOs are listed as ignored, not read."""
+        repo_path = self.copy_repo()
+        os.symlink(repo_path / "missing.txt", repo_path / "broken.txt")
+        if hasattr(os, "mkfifo"):
+            os.mkfifo(repo_path / "pipe.txt")
+
+        result = scan_repository(repo_path, verbose=True)
+
+        self.assertIn(repo_path / "broken.txt", result.ignored_files)
+        if hasattr(os, "mkfifo"):
+            self.assertIn(repo_path / "pipe.txt", result.ignored_files)
+        file_names = {f.path.name for f in result.files}
+        self.assertNotIn("broken.txt", file_names)
+        self.assertNotIn("pipe.txt", file_names)
+
 
 class TestScopedScan(TestCase):
     """Test repository scanning with scope filtering."""
 
     def setUp(self):
         """Create a temporary directory with files."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = self.enterContext(tempfile.TemporaryDirectory())
         self.repo_root = Path(self.temp_dir)
 
         (self.repo_root / "included.py").write_text("# included")
         (self.repo_root / "excluded.py").write_text("# excluded")
 
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
-
     def test_scan_with_scope_whitelist(self):
         """Test scanning respects scope whitelist."""
         from repo2ai.scope import ScopeConfig
@@ -337,6 +546,78 @@ class TestMarkdownGeneration(TestCase):
         self.assertIn("```python", markdown)
         self.assertIn("```javascript", markdown)
 
+    def test_iter_markdown_matches_generate_markdown(self):
+        """Test streamed and joined markdown both match the expected document."""
+        repo_root = Path("/test/repo")
+        files = [
+            RepoFile(
+                path=repo_root / "test.py",
+                content='print("Hello")',
+                size=15,
+                language="python",
+            ),
+            RepoFile(
+                path=repo_root / "pkg" / "notes",
+                content="plain",
+                size=5,
+                language=None,
+            ),
+        ]
+
+        scan_result = ScanResult(
+            files=files,
+            repo_root=repo_root,
+            total_size=20,
+            ignored_files=[],
+            included_files=[],
+        )
+        expected = (
+            "# repo\n"
+            "\n"
+            "## Repository Summary\n"
+            "\n"
+            "- **Files:** 2\n"
+            "- **Total Size:** 0.00 MB\n"
+            f"- **Repository Root:** `{repo_root}`\n"
+            "\n"
+            "## File Structure\n"
+            "\n"
+            "### Root Directory\n"
+            "\n"
+            "- test.py\n"
+            "\n"
+            f"### {Path('pkg')}/\n"
+            "\n"
+            "- notes\n"
+            "\n"
+            "## File Contents\n"
+            "\n"
+            f"### {Path('pkg', 'notes')}\n"
+            "\n"
+            "**Size:** 5 bytes\n"
+            "\n"
+            "```\n"
+            "plain\n"
+            "```\n"
+            "\n"
+            "### test.py\n"
+            "\n"
+            "**Size:** 15 bytes\n"
+            "**Language:** python\n"
+            "\n"
+            "```python\n"
+            'print("Hello")\n'
+            "```\n"
+        )
+
+        chunks = list(iter_markdown(scan_result))
+
+        # File contents are passed through as chunks of their own
+        self.assertIn('print("Hello")', chunks)
+        self.assertIn("plain", chunks)
+        self.assertEqual("".join(chunks), expected)
+        self.assertEqual(generate_markdown(scan_result), expected)
+
 
 if __name__ == "__main__":
     import unittest
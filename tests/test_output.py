@@ -2,6 +2,7 @@
 Tests for output functionality.
 """
 
+import os
 import tempfile
 from pathlib import Path
 from unittest import TestCase
@@ -11,6 +12,7 @@ from io import StringIO
 from repo2ai.output import (
     handle_output,
     get_default_output_filename,
+    _native_clipboard_command,
 )
 
 
@@ -19,44 +21,54 @@ class TestOutputHandling(TestCase):
 
     def setUp(self):
         """Set up test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.output_file = Path(self.temp_dir) / "test.md"
+        self.subdir_output_file = Path(self.temp_dir) / "subdir" / "test.md"
         self.test_content = "# Test Markdown\n\nThis is a test."
 
-    def tearDown(self):
-        """Clean up test environment."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+        # Exercise the pyperclip path regardless of the host's clipboard tools
+        native_patcher = patch(
+            "repo2ai.output._native_clipboard_command", return_value=None
+        )
+        native_patcher.start()
+        self.addCleanup(native_patcher.stop)
+
+        # Status messages go to stderr in every test
+        stderr_patcher = patch("sys.stderr", new_callable=StringIO)
+        stderr_patcher.start()
+        self.addCleanup(stderr_patcher.stop)
+
+    def assertFileBytes(self, path, expected):
+        """Assert a file holds exactly the UTF-8 encoding of expected."""
+        # Files are written in text mode, so newlines are platform-specific
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data, expected.replace("\n", os.linesep).encode("utf-8"))
 
     def test_file_output(self):
         """Test writing to file."""
-        output_file = Path(self.temp_dir) / "test.md"
-
-        with patch("sys.stderr", new_callable=StringIO):
-            handle_output(
-                content=self.test_content,
-                output_file=output_file,
-                to_clipboard=False,
-                to_stdout=False,
-            )
+        handle_output(
+            content=self.test_content,
+            output_file=self.output_file,
+            to_clipboard=False,
+            to_stdout=False,
+        )
 
         # Check file was created with correct content
-        self.assertTrue(output_file.exists())
-        self.assertEqual(output_file.read_text(), self.test_content)
+        self.assertTrue(self.output_file.exists())
+        self.assertFileBytes(self.output_file, self.test_content)
 
     def test_stdout_output(self):
         """Test output to stdout."""
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
-            with patch("sys.stderr", new_callable=StringIO):
-                handle_output(content=self.test_content, to_stdout=True)
+            handle_output(content=self.test_content, to_stdout=True)
 
         self.assertEqual(mock_stdout.getvalue().strip(), self.test_content)
 
     def test_default_stdout(self):
         """Test default behavior outputs to stdout."""
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
-            with patch("sys.stderr", new_callable=StringIO):
-                handle_output(content=self.test_content)
+            handle_output(content=self.test_content)
 
         self.assertEqual(mock_stdout.getvalue().strip(), self.test_content)
 
@@ -64,63 +76,143 @@ class TestOutputHandling(TestCase):
     @patch("repo2ai.output.pyperclip")
     def test_clipboard_output(self, mock_pyperclip):
         """Test clipboard output."""
-        with patch("sys.stderr", new_callable=StringIO):
-            handle_output(content=self.test_content, to_clipboard=True, to_stdout=False)
+        handle_output(content=self.test_content, to_clipboard=True, to_stdout=False)
 
         mock_pyperclip.copy.assert_called_once_with(self.test_content)
 
     @patch("repo2ai.output.PYPERCLIP_AVAILABLE", False)
     def test_clipboard_unavailable(self):
         """Test clipboard output when pyperclip is unavailable."""
-        with patch("sys.stderr", new_callable=StringIO):
-            with self.assertRaises(SystemExit):
-                handle_output(
-                    content=self.test_content, to_clipboard=True, to_stdout=False
-                )
+        with self.assertRaises(SystemExit):
+            handle_output(content=self.test_content, to_clipboard=True, to_stdout=False)
+
+    @patch("repo2ai.output.subprocess.run")
+    @patch("repo2ai.output.pyperclip")
+    def test_native_clipboard_output(self, mock_pyperclip, mock_run):
+        """Test clipboard output through a native clipboard command."""
+        command = ["xclip", "-selection", "clipboard"]
+        with patch("repo2ai.output._native_clipboard_command", return_value=command):
+            handle_output(content=self.test_content, to_clipboard=True, to_stdout=False)
+
+        mock_run.assert_called_once_with(
+            command, input=self.test_content.encode("utf-8"), check=True
+        )
+        mock_pyperclip.copy.assert_not_called()
 
     def test_multiple_outputs(self):
         """Test multiple output options."""
-        output_file = Path(self.temp_dir) / "test.md"
-
         with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
-            with patch("sys.stderr", new_callable=StringIO):
-                with patch("repo2ai.output.PYPERCLIP_AVAILABLE", True):
-                    with patch("repo2ai.output.pyperclip") as mock_pyperclip:
-                        handle_output(
-                            content=self.test_content,
-                            output_file=output_file,
-                            to_clipboard=True,
-                            to_stdout=True,
-                        )
+            with patch("repo2ai.output.PYPERCLIP_AVAILABLE", True):
+                with patch("repo2ai.output.pyperclip") as mock_pyperclip:
+                    handle_output(
+                        content=self.test_content,
+                        output_file=self.output_file,
+                        to_clipboard=True,
+                        to_stdout=True,
+                    )
 
         # Check all outputs were used
-        self.assertTrue(output_file.exists())
-        self.assertEqual(output_file.read_text(), self.test_content)
+        self.assertTrue(self.output_file.exists())
+        self.assertFileBytes(self.output_file, self.test_content)
         self.assertEqual(mock_stdout.getvalue().strip(), self.test_content)
         mock_pyperclip.copy.assert_called_once_with(self.test_content)
 
     def test_file_output_creates_directory(self):
         """Test that file output creates parent directories."""
-        output_file = Path(self.temp_dir) / "subdir" / "test.md"
+        handle_output(
+            content=self.test_content,
+            output_file=self.subdir_output_file,
+            to_stdout=False,
+        )
+
+        self.assertTrue(self.subdir_output_file.exists())
+        self.assertFileBytes(self.subdir_output_file, self.test_content)
+
+    def test_streamed_file_output(self):
+        """Test writing an iterable of chunks to file."""
+        chunks = iter(["# Test Markdown", "\n\n", "This is a test."])
+
+        handle_output(content=chunks, output_file=self.output_file, to_stdout=False)
+
+        self.assertFileBytes(self.output_file, self.test_content)
+
+    def test_streamed_stdout_output(self):
+        """Test writing an iterable of chunks to stdout."""
+        chunks = iter(["# Test Markdown", "\n\n", "This is a test."])
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
+            handle_output(content=chunks, to_stdout=True)
+
+        self.assertEqual(mock_stdout.getvalue(), self.test_content + "\n")
 
-        with patch("sys.stderr", new_callable=StringIO):
+    @patch("repo2ai.output.PYPERCLIP_AVAILABLE", True)
+    @patch("repo2ai.output.pyperclip")
+    def test_streamed_multiple_outputs(self, mock_pyperclip):
+        """Test chunks are joined when several outputs need the content."""
+        chunks = iter(["# Test Markdown", "\n\n", "This is a test."])
+
+        with patch("sys.stdout", new_callable=StringIO) as mock_stdout:
             handle_output(
-                content=self.test_content, output_file=output_file, to_stdout=False
+                content=chunks,
+                output_file=self.output_file,
+                to_clipboard=True,
+                to_stdout=True,
+            )
+
+        self.assertFileBytes(self.output_file, self.test_content)
+        self.assertEqual(mock_stdout.getvalue().strip(), self.test_content)
+        mock_pyperclip.copy.assert_called_once_with(self.test_content)
+
+    def test_file_output_without_ensure_parent(self):
+        """Test missing parent directories are not created when disabled."""
+        output_file = Path(self.temp_dir) / "missing" / "test.md"
+
+        with self.assertRaises(SystemExit):
+            handle_output(
+                content=self.test_content,
+                output_file=output_file,
+                to_stdout=False,
+                ensure_parent=False,
             )
 
-        self.assertTrue(output_file.exists())
-        self.assertEqual(output_file.read_text(), self.test_content)
+        self.assertFalse(output_file.parent.exists())
 
     def test_file_output_error(self):
         """Test file output error handling."""
         # Try to write to a directory instead of file
         output_file = Path(self.temp_dir)
 
-        with patch("sys.stderr", new_callable=StringIO):
-            with self.assertRaises(SystemExit):
-                handle_output(
-                    content=self.test_content, output_file=output_file, to_stdout=False
-                )
+        with self.assertRaises(SystemExit):
+            handle_output(
+                content=self.test_content, output_file=output_file, to_stdout=False
+            )
+
+
+class TestNativeClipboardLookup(TestCase):
+    """Test the native clipboard command is looked up lazily."""
+
+    def setUp(self):
+        """Start every test with an empty lookup cache."""
+        _native_clipboard_command.cache_clear()
+        self.addCleanup(_native_clipboard_command.cache_clear)
+
+    @patch("repo2ai.output.shutil.which", return_value=None)
+    def test_lookup_only_on_clipboard_use(self, mock_which):
+        """Test PATH is probed on first clipboard use only, then cached."""
+        with patch("sys.stdout", new_callable=StringIO):
+            handle_output(content="text", to_stdout=True)
+        mock_which.assert_not_called()
+
+        self.enterContext(patch("sys.platform", "linux"))
+        self.enterContext(patch.dict(os.environ, {"DISPLAY": ":0"}))
+        os.environ.pop("WAYLAND_DISPLAY", None)
+        self.enterContext(patch("repo2ai.output.PYPERCLIP_AVAILABLE", True))
+        self.enterContext(patch("repo2ai.output.pyperclip"))
+        self.enterContext(patch("sys.stderr", new_callable=StringIO))
+        handle_output(content="text", to_clipboard=True, to_stdout=False)
+        handle_output(content="text", to_clipboard=True, to_stdout=False)
+
+        mock_which.assert_called_once_with("xclip")
 
 
 class TestDefaultFilename(TestCase):
@@ -0,0 +1,57 @@
+"""
+Tests for the package's lazy attribute access.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import TestCase
+
+import repo2ai
+
+# Directory holding the repo2ai package, for the fresh interpreters below
+_PACKAGE_PARENT = str(Path(repo2ai.__file__).resolve().parents[1])
+
+
+def _run_fresh(code: str) -> subprocess.CompletedProcess:
+    """Run code in a new interpreter where no repo2ai submodule is loaded."""
+    pythonpath = os.pathsep.join(
+        filter(None, [_PACKAGE_PARENT, os.environ.get("PYTHONPATH")])
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "PYTHONPATH": pythonpath},
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestLazyAttributes(TestCase):
+    """Test attribute access on a bare `import repo2ai`."""
+
+    def test_submodules_are_attributes(self):
+        """Test submodules are reachable without importing them first."""
+        result = _run_fresh(
+            "import repo2ai\n"
+            "for name in ('core', 'output', 'scope', 'pr', 'browser', 'cli'):\n"
+            "    print(getattr(repo2ai, name).__name__)\n"
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(
+            result.stdout.split(),
+            [
+                "repo2ai.core",
+                "repo2ai.output",
+                "repo2ai.scope",
+                "repo2ai.pr",
+                "repo2ai.browser",
+                "repo2ai.cli",
+            ],
+        )
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        """Test names that are neither exports nor submodules still fail."""
+        with self.assertRaises(AttributeError):
+            repo2ai.no_such_name
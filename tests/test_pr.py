@@ -1,7 +1,5 @@
 """Tests for PR review functionality."""
 
-import subprocess
-import tempfile
 from pathlib import Path
 import re
 from unittest import TestCase
@@ -15,44 +13,19 @@ from repo2ai.pr import (
     generate_pr_markdown,
 )
 
+from ._git_helpers import GitRepoTestCase, run_git
 
-class TestTargetBranchDetection(TestCase):
-    """Test target branch detection logic."""
-
-    def setUp(self):
-        """Create a temporary git repository."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_root = Path(self.temp_dir)
-
-        # Initialize git repo with main branch
-        subprocess.run(
-            ["git", "init", "-b", "main"], cwd=self.repo_root, capture_output=True
-        )
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
+# Summary fields of the PR markdown, each matched within its own line
+_SUMMARY_RE = re.compile(
+    r"Branch[^\n]*`feature-x`.*Target[^\n]*`main`.*Commits[^\n]*2", re.S
+)
 
-        # Create initial commit on main
-        (self.repo_root / "file.txt").write_text("initial")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
 
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
+class TestTargetBranchDetection(GitRepoTestCase):
+    """Test target branch detection logic."""
 
-        shutil.rmtree(self.temp_dir)
+    MUTATES_REPO = True
+    HISTORY = [{"files": {"file.txt": "initial"}, "message": "Initial commit"}]
 
     def test_explicit_target_used(self):
         """Test that explicit target overrides detection."""
@@ -62,68 +35,34 @@ class TestTargetBranchDetection(TestCase):
     def test_fallback_to_main(self):
         """Test fallback to main when no upstream."""
         # Create feature branch without upstream
-        subprocess.run(
-            ["git", "checkout", "-b", "feature"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
+        run_git(self.repo_root, "checkout", "-b", "feature")
 
         result = get_target_branch(self.repo_root, explicit_target=None)
         self.assertEqual(result, "main")
 
+    def test_detects_other_base_branch(self):
+        """Test a base branch other than main is found when main is current."""
+        run_git(self.repo_root, "branch", "develop")
 
-class TestDiffGeneration(TestCase):
-    """Test diff generation between branches."""
-
-    def setUp(self):
-        """Create a temporary git repository with branches."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_root = Path(self.temp_dir)
-
-        # Initialize git repo
-        subprocess.run(
-            ["git", "init", "-b", "main"], cwd=self.repo_root, capture_output=True
-        )
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create initial commit on main
-        (self.repo_root / "existing.py").write_text("# existing\n")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
+        result = get_target_branch(self.repo_root, explicit_target=None)
+        self.assertEqual(result, "develop")
 
-        # Create feature branch with changes
-        subprocess.run(
-            ["git", "checkout", "-b", "feature"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        (self.repo_root / "existing.py").write_text("# existing\n# modified\n")
-        (self.repo_root / "new_file.py").write_text("# new file\n")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Feature changes"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
 
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
+class TestDiffGeneration(GitRepoTestCase):
+    """Test diff generation between branches."""
 
-        shutil.rmtree(self.temp_dir)
+    MUTATES_REPO = True
+    HISTORY = [
+        {"files": {"existing.py": "# existing\n"}, "message": "Initial commit"},
+        {
+            "branch": "feature",
+            "files": {
+                "existing.py": "# existing\n# modified\n",
+                "new_file.py": "# new file\n",
+            },
+            "message": "Feature changes",
+        },
+    ]
 
     def test_get_branch_diff(self):
         """Test getting diff between branches."""
@@ -134,69 +73,32 @@ class TestDiffGeneration(TestCase):
 
     def test_diff_empty_when_same(self):
         """Test empty diff when branches are same."""
-        subprocess.run(
-            ["git", "checkout", "main"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
+        run_git(self.repo_root, "checkout", "main")
 
         diff = get_branch_diff(self.repo_root, "main")
         self.assertEqual(diff, "")
 
 
-class TestChangedFiles(TestCase):
+class TestChangedFiles(GitRepoTestCase):
     """Test changed files detection."""
 
-    def setUp(self):
-        """Create a temporary git repository with branches."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_root = Path(self.temp_dir)
-
-        # Initialize git repo
-        subprocess.run(
-            ["git", "init", "-b", "main"], cwd=self.repo_root, capture_output=True
-        )
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create initial commit on main
-        (self.repo_root / "existing.py").write_text("# existing\n")
-        (self.repo_root / "unchanged.py").write_text("# unchanged\n")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create feature branch with changes
-        subprocess.run(
-            ["git", "checkout", "-b", "feature"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        (self.repo_root / "existing.py").write_text("# existing\n# modified\n")
-        (self.repo_root / "new_file.py").write_text("# new file\n")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Feature changes"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+    HISTORY = [
+        {
+            "files": {
+                "existing.py": "# existing\n",
+                "unchanged.py": "# unchanged\n",
+            },
+            "message": "Initial commit",
+        },
+        {
+            "branch": "feature",
+            "files": {
+                "existing.py": "# existing\n# modified\n",
+                "new_file.py": "# new file\n",
+            },
+            "message": "Feature changes",
+        },
+    ]
 
     def test_get_changed_files(self):
         """Test getting list of changed files."""
@@ -208,57 +110,17 @@ class TestChangedFiles(TestCase):
         self.assertNotIn(self.repo_root / "unchanged.py", files)
 
 
-class TestPRContext(TestCase):
+class TestPRContext(GitRepoTestCase):
     """Test PR context generation."""
 
-    def setUp(self):
-        """Create a temporary git repository with branches."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_root = Path(self.temp_dir)
-
-        # Initialize git repo
-        subprocess.run(
-            ["git", "init", "-b", "main"], cwd=self.repo_root, capture_output=True
-        )
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create initial commit on main
-        (self.repo_root / "file.py").write_text("# original\n")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create feature branch
-        subprocess.run(
-            ["git", "checkout", "-b", "my-feature"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        (self.repo_root / "file.py").write_text("# modified\n")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "My feature"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+    HISTORY = [
+        {"files": {"file.py": "# original\n"}, "message": "Initial commit"},
+        {
+            "branch": "my-feature",
+            "files": {"file.py": "# modified\n"},
+            "message": "My feature",
+        },
+    ]
 
     def test_get_pr_context(self):
         """Test getting full PR context."""
@@ -290,13 +152,15 @@ class TestPRMarkdown(TestCase):
         )
 
         # Check structure
-        self.assertIn("# PR Review: feature-x → main", markdown)
-        self.assertIn("## Summary", markdown)
-        self.assertTrue(re.search(r"Branch.*`feature-x`", markdown))
-        self.assertTrue(re.search(r"Target.*`main`", markdown))
-        self.assertTrue(re.search(r"Commits.*2", markdown))
-        self.assertIn("## Diff", markdown)
-        self.assertIn("```diff", markdown)
-        self.assertIn("+new", markdown)
-        self.assertIn("## Changed Files", markdown)
-        self.assertIn("### file.py", markdown)
+        needles = (
+            "# PR Review: feature-x → main",
+            "## Summary",
+            "## Diff",
+            "```diff",
+            "+new",
+            "## Changed Files",
+            "### file.py",
+        )
+        missing = [needle for needle in needles if needle not in markdown]
+        self.assertFalse(missing, f"missing from markdown: {missing}")
+        self.assertRegex(markdown, _SUMMARY_RE)
@@ -2,12 +2,12 @@
 Tests for scope filtering functionality.
 """
 
-import subprocess
 import tempfile
 from pathlib import Path
 from unittest import TestCase
 
 from repo2ai.scope import (
+    _parse_status_paths,
     get_files_from_recent_commits,
     get_uncommitted_files,
     get_files_from_glob_patterns,
@@ -15,51 +15,16 @@ from repo2ai.scope import (
     ScopeConfig,
 )
 
+from ._git_helpers import GitRepoTestCase, run_git
 
-class TestGitCommitScope(TestCase):
-    """Test git commit-based scope filtering."""
-
-    def setUp(self):
-        """Create a temporary git repository with commits."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_root = Path(self.temp_dir)
-
-        # Initialize git repo
-        subprocess.run(["git", "init"], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
 
-        # Create initial file and commit
-        (self.repo_root / "old_file.py").write_text("# old")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create recent file and commit
-        (self.repo_root / "recent_file.py").write_text("# recent")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Recent commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
+class TestGitCommitScope(GitRepoTestCase):
+    """Test git commit-based scope filtering."""
 
-        shutil.rmtree(self.temp_dir)
+    HISTORY = [
+        {"files": {"old_file.py": "# old"}, "message": "Initial commit"},
+        {"files": {"recent_file.py": "# recent"}, "message": "Recent commit"},
+    ]
 
     def test_get_files_from_last_commit(self):
         """Test getting files changed in last N commits."""
@@ -84,45 +49,17 @@ class TestGitCommitScope(TestCase):
             self.assertEqual(files, set())
 
 
-class TestUncommittedScope(TestCase):
+class TestUncommittedScope(GitRepoTestCase):
     """Test uncommitted changes scope filtering."""
 
-    def setUp(self):
-        """Create a temporary git repository with uncommitted changes."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.repo_root = Path(self.temp_dir)
-
-        # Initialize git repo
-        subprocess.run(["git", "init"], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create committed file
-        (self.repo_root / "committed.py").write_text("# committed")
-        subprocess.run(["git", "add", "."], cwd=self.repo_root, capture_output=True)
-        subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
-            cwd=self.repo_root,
-            capture_output=True,
-        )
-
-        # Create uncommitted changes
-        (self.repo_root / "committed.py").write_text("# modified")
-        (self.repo_root / "new_file.py").write_text("# new")
+    MUTATES_REPO = True
+    HISTORY = [{"files": {"committed.py": "# committed"}, "message": "Initial commit"}]
 
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+    @classmethod
+    def prepare_repo(cls, repo_root):
+        """Leave uncommitted changes in the work tree."""
+        (repo_root / "committed.py").write_text("# modified")
+        (repo_root / "new_file.py").write_text("# new")
 
     def test_get_uncommitted_modified_files(self):
         """Test getting files with uncommitted modifications."""
@@ -138,40 +75,102 @@ class TestUncommittedScope(TestCase):
 
     def test_staged_files_included(self):
         """Test that staged files are included."""
-        subprocess.run(
-            ["git", "add", "new_file.py"], cwd=self.repo_root, capture_output=True
-        )
+        run_git(self.repo_root, "add", "new_file.py")
 
         files = get_uncommitted_files(self.repo_root)
 
         self.assertIn(self.repo_root / "new_file.py", files)
 
+    def test_subdirectory_root(self):
+        """Test a repo_root below the top level only sees its own files."""
+        (self.repo_root / "sub").mkdir()
+        (self.repo_root / "sub" / "new.py").write_text("# new")
+        (self.repo_root / "sub" / "new2.py").write_text("# new")
+
+        files = get_uncommitted_files(self.repo_root / "sub")
+
+        self.assertEqual(
+            files,
+            {self.repo_root / "sub" / "new.py", self.repo_root / "sub" / "new2.py"},
+        )
+
+    def test_paths_with_spaces_and_non_ascii(self):
+        """Test paths are neither quoted nor split on spaces."""
+        (self.repo_root / "my dir").mkdir()
+        file_path = self.repo_root / "my dir" / "n\u00e4me with space.py"
+        file_path.write_text("# new")
+
+        files = get_uncommitted_files(self.repo_root)
+
+        self.assertIn(file_path, files)
+
+    def test_unmerged_files_included(self):
+        """Test files with merge conflicts are included."""
+        run_git(self.repo_root, "checkout", "-b", "other")
+        (self.repo_root / "committed.py").write_text("# other")
+        run_git(self.repo_root, "commit", "-am", "Other change")
+        run_git(self.repo_root, "checkout", "main")
+        (self.repo_root / "committed.py").write_text("# main")
+        run_git(self.repo_root, "commit", "-am", "Main change")
+        run_git(self.repo_root, "merge", "other")
+
+        status = run_git(self.repo_root, "status", "--porcelain=v2").stdout
+        self.assertIn(b"u UU", status)
+
+        files = get_uncommitted_files(self.repo_root)
+
+        self.assertIn(self.repo_root / "committed.py", files)
+
+
+class TestStatusParsing(TestCase):
+    """Test parsing of `git status --porcelain=v2 -z` records."""
+
+    def test_parse_status_paths(self):
+        """Test each record type yields its path, spaces included."""
+        output = b"\0".join(
+            [
+                b"# branch.oid 1234",
+                b"1 .M N... 100644 100644 100644 aaa bbb src/main file.py",
+                b"2 R. N... 100644 100644 100644 aaa bbb R100 new name.py",
+                b"old name.py",
+                b"u UU N... 100644 100644 100644 100644 aaa bbb ccc "
+                + "conflict \u00fc.py".encode(),
+                b"? untracked file.py",
+                b"",
+            ]
+        )
+
+        self.assertEqual(
+            list(_parse_status_paths(output)),
+            [
+                "src/main file.py",
+                "new name.py",
+                "conflict \u00fc.py",
+                "untracked file.py",
+            ],
+        )
+
 
 class TestGlobScope(TestCase):
     """Test glob pattern scope filtering."""
 
+    FILES = {
+        "src/main.py": "# main",
+        "src/module/core.py": "# core",
+        "src/module/utils.py": "# utils",
+        "tests/test_main.py": "# test",
+        "README.md": "# readme",
+    }
+
     def setUp(self):
         """Create a temporary directory with files."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = self.enterContext(tempfile.TemporaryDirectory())
         self.repo_root = Path(self.temp_dir)
 
-        # Create directory structure
-        (self.repo_root / "src").mkdir()
-        (self.repo_root / "src" / "module").mkdir()
-        (self.repo_root / "tests").mkdir()
-
-        # Create files
-        (self.repo_root / "src" / "main.py").write_text("# main")
-        (self.repo_root / "src" / "module" / "core.py").write_text("# core")
-        (self.repo_root / "src" / "module" / "utils.py").write_text("# utils")
-        (self.repo_root / "tests" / "test_main.py").write_text("# test")
-        (self.repo_root / "README.md").write_text("# readme")
-
-    def tearDown(self):
-        """Clean up temporary directory."""
-        import shutil
-
-        shutil.rmtree(self.temp_dir)
+        for relative_path, content in self.FILES.items():
+            file_path = self.repo_root / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_bytes(content.encode())
 
     def test_recursive_glob_pattern(self):
         """Test **/*.py recursive glob pattern."""
@@ -210,6 +209,24 @@ class TestGlobScope(TestCase):
         self.assertEqual(len(files), 1)
         self.assertIn(self.repo_root / "tests" / "test_main.py", files)
 
+    def test_hidden_paths_need_explicit_dot(self):
+        """Test wildcards skip dot paths unless the pattern names them."""
+        (self.repo_root / ".github").mkdir()
+        (self.repo_root / ".github" / "ci.py").write_text("# ci")
+        (self.repo_root / "src" / ".hidden.py").write_text("# hidden")
+
+        files = get_files_from_glob_patterns(self.repo_root, ["**/*.py"])
+        self.assertEqual(len(files), 4)
+
+        files = get_files_from_glob_patterns(self.repo_root, [".github/*", "src/.*"])
+        self.assertEqual(
+            files,
+            {
+                self.repo_root / ".github" / "ci.py",
+                self.repo_root / "src" / ".hidden.py",
+            },
+        )
+
 
 class TestCombinedScope(TestCase):
     """Test combined scope filtering."""